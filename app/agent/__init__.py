@@ -1,19 +1,32 @@
-from app.agent.agent import ArticleSummarizerAgent
-from app.agent.schemas import ArticleSummary
-from app.agent.tools import (
-    clean_markdown, 
-    summarize_article, 
-    send_email_with_content,
-    aggregate_today_news,
-    send_daily_news_email
-)
+"""
+Agent package. The public names below are imported on first access, so importing a
+light submodule (app.agent.cache, app.agent.language_config) does not load the LLM stack.
+"""
+from importlib import import_module
 
-__all__ = [
-    'ArticleSummarizerAgent', 
-    'ArticleSummary', 
-    'clean_markdown', 
-    'summarize_article', 
-    'send_email_with_content',
-    'aggregate_today_news',
-    'send_daily_news_email'
-]
+# Public name -> submodule that defines it
+_EXPORTS = {
+    'ArticleSummarizerAgent': 'app.agent.agent',
+    'ArticleSummary': 'app.agent.schemas',
+    'clean_markdown': 'app.agent.tools',
+    'summarize_article': 'app.agent.tools',
+    'asummarize_article': 'app.agent.tools',
+    'summarize_articles_batch': 'app.agent.tools',
+    'send_email_with_content': 'app.agent.tools',
+    'aggregate_today_news': 'app.agent.tools',
+    'send_daily_news_email': 'app.agent.tools',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
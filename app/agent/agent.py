@@ -3,61 +3,182 @@ Simple LangGraph agent to process articles: clean markdown and generate structur
 """
 import os
 import io
-from typing import TypedDict
+import asyncio
+import hashlib
+from functools import lru_cache
+from typing import List, Optional, TypedDict
+from urllib.parse import urlparse
+from rapidfuzz import fuzz
 from langgraph.graph import StateGraph, END
-from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
-from openai import OpenAI
 from app.scrapers.rss_scraper import extraction
-from app.agent.tools import clean_markdown, summarize_article, summarize_article_with_web_search, rank_article
-from app.agent.language_config import get_language_config, get_header
+from app.agent.tools import clean_markdown, summarize_articles_batch, asummarize_article_with_web_search, rank_articles_batch
+from app.agent import language_config
+from app.agent.prompts import (
+    ARTICLE_SUMMARIZER_PROMPT_WITH_WEB_SEARCH, ARTICLE_SUMMARIZER_WEB_SEARCH_INPUT,
+    get_newsletter_system_prompt, get_newsletter_user_prompt
+)
 from app.agent.schemas import TitleTranslation
-from IPython.display import Image, display
-from dotenv import load_dotenv
-load_dotenv()
+from app.agent import cache
+from app.agent.http_clients import SHARED_ASYNC_CLIENT, SHARED_SYNC_CLIENT, run
+
+# Plain-text summary layout, section headers come from the language config
+SUMMARY_TMPL = """{headers.overview}:
+{overview}
+
+{headers.key_points}:
+{key_points}
+
+{headers.why_it_matters}:
+{why_it_matters}
+
+{headers.simple_explanation}:
+{simple_explanation}"""
+KEY_POINT_TMPL = "• {}"
+
+
+@lru_cache(maxsize=1)
+def _get_chat_openai():
+    """Import ChatOpenAI on first use, langchain_openai is slow to import."""
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI
+
+
+_TRANSLATE_TITLE_TEMPLATE = (
+    "Traduce este título al español. Mantén nombres propios (empresas, personas) sin cambios.\n\nTítulo: {title}"
+)
+TRANSLATE_TITLE_PROMPT = ChatPromptTemplate.from_template(_TRANSLATE_TITLE_TEMPLATE)
+
+# Every prompt and template behind a cached article (title, content, summary text),
+# hashed into its cache key so editing any of them invalidates the entries
+_ARTICLE_CACHE_PROMPT = "".join((
+    _TRANSLATE_TITLE_TEMPLATE,
+    ARTICLE_SUMMARIZER_PROMPT_WITH_WEB_SEARCH,
+    ARTICLE_SUMMARIZER_WEB_SEARCH_INPUT,
+    get_newsletter_system_prompt(),
+    get_newsletter_user_prompt(),
+    SUMMARY_TMPL
+))
+
+# Titles above this token sort ratio are treated as the same story. Token sort, not token
+# set: a title whose words are a subset of another ("Stocks rally" vs "Stocks rally as Fed
+# holds rates") scores 100 on token set although it is a different story
+DUPLICATE_TITLE_RATIO = 90
+
+
+def _canonical_url(link: str) -> str:
+    """Normalize a link for duplicate detection: drop query, fragment and trailing slash."""
+    parsed = urlparse(link.strip())
+    return parsed._replace(
+        scheme=parsed.scheme.lower(),
+        netloc=parsed.netloc.lower(),
+        path=parsed.path.rstrip("/"),
+        query="",
+        fragment=""
+    ).geturl()
+
+
+def dedupe_articles(items: List[dict]) -> List[dict]:
+    """
+    Collapse articles that point to the same story before any LLM work.
+    
+    Two articles are duplicates when their canonical URLs match or their
+    titles are near-identical (RapidFuzz token sort ratio). The first
+    occurrence is kept and its article gets a dup_count with the number
+    of copies seen, so the ranker can favour widely covered stories.
+    
+    Args:
+        items: Dicts with an "article" key, as built by the rank node
+        
+    Returns:
+        The unique items, in their original order
+    """
+    unique = []
+    by_url = {}
+    titles = []  # (normalized title, item) of kept items for the fuzzy pass
+    for item in items:
+        article = item["article"]
+        link = article.get("link", "")
+        title = article.get("title", "").lower()[:80]
+        
+        kept = by_url.get(_canonical_url(link)) if link else None
+        if kept is None and title:
+            kept = next(
+                (other for other_title, other in titles
+                 if fuzz.token_sort_ratio(title, other_title) > DUPLICATE_TITLE_RATIO),
+                None
+            )
+        
+        if kept is not None:
+            kept["article"]["dup_count"] = kept["article"].get("dup_count", 1) + 1
+            continue
+        
+        article["dup_count"] = 1
+        unique.append(item)
+        if link:
+            by_url[_canonical_url(link)] = item
+        if title:
+            titles.append((title, item))
+    return unique
+
 
 class AgentState(TypedDict):
     """State for article processing."""
     extraction_data: extraction
-    collection_index: int
-    article_index: int
 
 
 class ArticleSummarizerAgent:
-    """Simple agent that processes articles sequentially."""
+    """Simple agent that ranks articles and processes the selected ones concurrently."""
     
-    def __init__(self, model: str = os.getenv("AGENT_MODEL"), temperature: float = 0.3):
+    def __init__(self, model: Optional[str] = None, temperature: float = 0.3):
+        from openai import AsyncOpenAI
+        
+        # Read at call time so .env loaded by the entrypoint is honoured
+        model = model or os.getenv("AGENT_MODEL")
         self.model = model
         self.temperature = temperature
-        self.llm = ChatOpenAI(model=model, temperature=temperature)
-        self.openai = OpenAI()
+        self.llm = _get_chat_openai()(
+            model=model,
+            temperature=temperature,
+            http_client=SHARED_SYNC_CLIENT,
+            http_async_client=SHARED_ASYNC_CLIENT
+        )
+        self.openai = AsyncOpenAI(http_client=SHARED_ASYNC_CLIENT)
+        self._translate_chain = TRANSLATE_TITLE_PROMPT | self.llm.with_structured_output(TitleTranslation)
+        self._headers = language_config.CONFIG.headers
         self.app = self._build_graph()
-        self._graph_to_png()
+        if os.getenv("RENDER_GRAPH_PNG") == "1":
+            self.render_graph()
     
     def _build_graph(self):
         """Build simple LangGraph workflow."""
         graph = StateGraph(AgentState)
         graph.add_node("rank", self._rank_node)
-        graph.add_node("process", self._process_node)
+        graph.add_node("process_all", self._process_all_node)
         graph.set_entry_point("rank")
-        graph.add_edge("rank", "process")
-        graph.add_conditional_edges(
-            "process",
-            self._should_continue,
-            {"continue": "process", "end": END}
-        )
+        graph.add_edge("rank", "process_all")
+        graph.add_edge("process_all", END)
         return graph.compile()
 
-    def _graph_to_png(self, path="app/agent"):
-        """Save graph schema as PNG image."""
+    def render_graph(self, path="app/agent"):
+        """
+        Save graph schema as PNG image.
+        The file name includes a hash of the graph nodes, so an unchanged graph is not rendered again.
+        """
         try:
             from pathlib import Path
             
-            # Get PNG bytes from LangGraph
-            png_bytes = self.app.get_graph().draw_mermaid_png()
+            graph = self.app.get_graph()
+            digest = hashlib.sha256(repr(graph.nodes).encode()).hexdigest()[:12]
+            output_path = Path(path) / f"graph_schema_{digest}.png"
+            if output_path.exists():
+                print(f"✓ Graph schema up to date: {output_path}")
+                return output_path
+            
+            # Get PNG bytes from LangGraph (renders through mermaid.ink)
+            png_bytes = graph.draw_mermaid_png()
             
             # Save PNG bytes directly to file
-            output_path = Path(path) / "graph_schema.png"
             output_path.parent.mkdir(parents=True, exist_ok=True)
             
             with open(output_path, 'wb') as f:
@@ -71,38 +192,32 @@ class ArticleSummarizerAgent:
                 display(Image(str(output_path)))
             except:
                 pass  # Not in IPython environment
+            
+            return output_path
                 
         except Exception as e:
             print(f"⚠️  Warning: Could not save graph schema: {e}")
     
-    def _translate_title(self, title: str) -> str:
+    async def _translate_title(self, title: str) -> str:
         """Translate article title to Spanish using structured output."""
         if not title or not title.strip():
             return title
         
         try:
-            prompt_template = ChatPromptTemplate.from_template(
-                "Traduce este título al español. Mantén nombres propios (empresas, personas) sin cambios.\n\nTítulo: {title}"
-            )
-            structured_llm = self.llm.with_structured_output(TitleTranslation)
-            chain = prompt_template | structured_llm
-            
-            result = chain.invoke({"title": title})
+            result = await self._translate_chain.ainvoke({"title": title})
             return result.translated_title
         except Exception as e:
             print(f"⚠️  Error traduciendo título: {e}")
             return title
     
-    def _rank_node(self, state: AgentState) -> AgentState:
+    async def _rank_node(self, state: AgentState) -> AgentState:
         """Rank all articles and select top 10 based on ranking score."""
         extraction_data = state.get("extraction_data", {})
         collections = extraction_data.get("scraping", [])
         
         if not collections:
             return {
-                "extraction_data": extraction_data,
-                "collection_index": 0,
-                "article_index": 0
+                "extraction_data": extraction_data
             }
         
         # Collect all articles with their collection info
@@ -120,33 +235,47 @@ class ArticleSummarizerAgent:
         total_articles = len(all_articles_with_context)
         if total_articles == 0:
             return {
-                "extraction_data": extraction_data,
-                "collection_index": 0,
-                "article_index": 0
+                "extraction_data": extraction_data
             }
         
+        # The same story often appears in several feeds, rank and summarize it once
+        all_articles_with_context = dedupe_articles(all_articles_with_context)
+        duplicates = total_articles - len(all_articles_with_context)
+        if duplicates:
+            print(f"✓ Removed {duplicates} duplicate articles")
+        
         print(f"\n{'='*60}")
-        print(f"Ranking {total_articles} articles...")
+        print(f"Ranking {len(all_articles_with_context)} articles...")
         print(f"{'='*60}\n")
         
-        # Rank each article
-        for idx, item in enumerate(all_articles_with_context):
-            article = item["article"]
-            title = article.get("title", "")
-            content = article.get("content", "")
-            link = article.get("link", "")
-            published = article.get("published", "")
-            source = item["source"]
-            
-            print(f"[{source}] Ranking {idx + 1}/{total_articles}: {title[:50]}...")
-            
+        # Rank with a local embedding model (RANK_MODE=embedding), with batched LLM calls,
+        # or with LLM calls for the best RANK_PREFILTER_K embedding matches only (RANK_MODE=hybrid)
+        articles_to_rank = [item["article"] for item in all_articles_with_context]
+        rank_mode = os.getenv("RANK_MODE", "llm").lower()
+        if rank_mode == "embedding":
+            from app.agent.embeddings import rank_articles_by_embedding
+            scores = await asyncio.to_thread(rank_articles_by_embedding, articles_to_rank)
+        elif rank_mode == "hybrid":
+            from app.agent.embeddings import prefilter_by_embedding
             try:
-                score = rank_article(title, content, link, published, self.llm)
-                article["rank_score"] = score
-                print(f"  Score: {score:.2f}")
-            except Exception as e:
-                print(f"  Error ranking article: {e}")
-                article["rank_score"] = 0.0
+                prefilter_k = int(os.getenv("RANK_PREFILTER_K", "20"))
+            except (ValueError, TypeError):
+                print(f"⚠️  Warning: RANK_PREFILTER_K env var is invalid, using default value: 20")
+                prefilter_k = 20
+            candidates = await asyncio.to_thread(prefilter_by_embedding, articles_to_rank, prefilter_k)
+            print(f"✓ Prefiltered {len(candidates)} of {len(articles_to_rank)} articles for LLM ranking")
+            # Articles dropped by the prefilter keep a 0.0 score and sort last
+            scores = [0.0] * len(articles_to_rank)
+            llm_scores = await rank_articles_batch([articles_to_rank[idx] for idx in candidates], self.llm)
+            for idx, score in zip(candidates, llm_scores):
+                scores[idx] = score
+        else:
+            if rank_mode != "llm":
+                print(f"⚠️  Warning: RANK_MODE '{rank_mode}' is invalid, using default value: llm")
+            scores = await rank_articles_batch(articles_to_rank, self.llm)
+        for item, score in zip(all_articles_with_context, scores):
+            item["article"]["rank_score"] = score
+            print(f"[{item['source']}] {item['article'].get('title', '')[:50]}... Score: {score:.2f}")
         
         # Sort all articles by rank_score (descending)
         all_articles_with_context.sort(key=lambda x: x["article"].get("rank_score", 0.0), reverse=True)
@@ -191,108 +320,134 @@ class ArticleSummarizerAgent:
         }
         
         return {
-            "extraction_data": ranked_extraction_data,
-            "collection_index": 0,
-            "article_index": 0
+            "extraction_data": ranked_extraction_data
         }
         
-    def _process_node(self, state: AgentState) -> AgentState:
-        """Process one article: clean markdown and generate summary."""
+    async def _process_all_node(self, state: AgentState) -> AgentState:
+        """Process all ranked articles: translate and fetch content concurrently, then summarize them in one batch."""
         extraction_data = state.get("extraction_data", {})
-        collection_index = state.get("collection_index", 0)
-        article_index = state.get("article_index", 0)
-        
-        collections = extraction_data.get("scraping", [])
-        
-        # Check if done
-        if collection_index >= len(collections):
-            return state
-        
-        collection = collections[collection_index]
-        articles = collection.get("articles", [])
-        
-        # Move to next collection if done with current
-        if article_index >= len(articles):
-            return {
-                "collection_index": collection_index + 1,
-                "article_index": 0
-            }
-        
-        # Get article and update in-place
-        article = articles[article_index]
-        original_title = article.get("title", "")
-        date = article.get("published", "")
-        source = collection.get("source", "Unknown")
-        
-        # Translate title to Spanish
-        translated_title = self._translate_title(original_title)
-        article["title"] = translated_title
-        title = translated_title  # Use translated title for processing
-        
-        print(f"[{source}] Processing {article_index + 1}/{len(articles)}: {title[:50]}...")
+        flat_articles = [
+            (article, collection.get("source", "Unknown"))
+            for collection in extraction_data.get("scraping", [])
+            for article in collection.get("articles", [])
+        ]
         
+        # Bound concurrent LLM requests to respect provider rate limits
         try:
-            # Step 1: Clean markdown
-            
-            # Use existing content if available, otherwise fetch with web search
-            existing_content = article.get("content", "")
-            if existing_content and existing_content.strip():
-                original_content = existing_content
-            else:
-                original_content = summarize_article_with_web_search(title, article.get("link", ""),date, self.openai)
-            article["content"] = original_content
-            
-            # Step 2: Generate structured summary
-            summary_obj = summarize_article(title, article["content"], self.llm)
-            
+            concurrency = int(os.getenv("LLM_CONCURRENCY", "10"))
+        except (ValueError, TypeError):
+            print(f"⚠️  Warning: LLM_CONCURRENCY env var is invalid, using default value: 10")
+            concurrency = 10
+        semaphore = asyncio.Semaphore(max(concurrency, 1))
+        # Web search requests are much slower and have their own, lower rate limits
+        try:
+            web_search_concurrency = int(os.getenv("WEB_SEARCH_CONCURRENCY", "8"))
+        except (ValueError, TypeError):
+            print(f"⚠️  Warning: WEB_SEARCH_CONCURRENCY env var is invalid, using default value: 8")
+            web_search_concurrency = 8
+        web_search_semaphore = asyncio.Semaphore(max(web_search_concurrency, 1))
+        
+        # Step 1: cache lookup, title translation and content recovery, updated in-place
+        cache_keys = await asyncio.gather(*(
+            self._prepare_one(article, source, semaphore, web_search_semaphore)
+            for article, source in flat_articles
+        ))
+        pending = [(article, key) for (article, _), key in zip(flat_articles, cache_keys) if key is not None]
+        
+        # Step 2: structured summaries for every article still missing one
+        summaries = await summarize_articles_batch(
+            [(article["title"], article["content"]) for article, _ in pending],
+            self.llm,
+            max_concurrency=concurrency
+        )
+        for (article, cache_key), (summary_obj, ok) in zip(pending, summaries):
             # Format summary as string with consistent structure using current language
-            lang_config = get_language_config()
-            summary_text = f"""{lang_config["headers"]["overview"]}:
-{summary_obj.overview}
-
-{lang_config["headers"]["key_points"]}:
-{chr(10).join(f"• {point}" for point in summary_obj.key_points)}
-
-{lang_config["headers"]["why_it_matters"]}:
-{summary_obj.why_it_matters}
-
-{lang_config["headers"]["simple_explanation"]}:
-{summary_obj.simple_explanation}"""
-            
+            summary_text = SUMMARY_TMPL.format(
+                headers=self._headers,
+                overview=summary_obj.overview,
+                key_points="\n".join(map(KEY_POINT_TMPL.format, summary_obj.key_points)),
+                why_it_matters=summary_obj.why_it_matters,
+                simple_explanation=summary_obj.simple_explanation
+            )
             article["summary"] = summary_text
-            
-        except Exception as e:
-            print(f"Error processing article: {e}")
-            article["summary"] = f"Error: {str(e)}"
-        
-        # Move to next article
-        return {"article_index": article_index + 1}
+            # Placeholders (no content, failed LLM call) are not cached, the next run retries them
+            if not ok or not article["content"].strip():
+                continue
+            cache.put(cache_key, {
+                "title": article["title"],
+                "content": article["content"],
+                "summary": summary_text
+            })
+        
+        print(f"\n✓ Processed {len(flat_articles)} articles")
+        return {"extraction_data": extraction_data}
     
-    def _should_continue(self, state: AgentState) -> str:
-        """Check if processing should continue."""
-        extraction_data = state.get("extraction_data", {})
-        collection_index = state.get("collection_index", 0)
-        article_index = state.get("article_index", 0)
-        
-        collections = extraction_data.get("scraping", [])
-        
-        if collection_index >= len(collections):
-            total = sum(len(c.get("articles", [])) for c in collections)
-            print(f"\n✓ Processed {total} articles")
-            return "end"
-        
-        collection = collections[collection_index]
-        articles = collection.get("articles", [])
-        
-        if article_index >= len(articles):
-            return "continue"  # Move to next collection
+    async def _prepare_one(
+        self, article: dict, source: str, semaphore: asyncio.Semaphore, web_search_semaphore: asyncio.Semaphore
+    ) -> Optional[str]:
+        """
+        Prepare one article in-place for summarization: translate title and fetch content.
         
-        return "continue"  # Process next article
+        Returns:
+            Cache key to store the summary under, or None when the article is already
+            done (cached from a previous run) or failed
+        """
+        async with semaphore:
+            original_title = article.get("title", "")
+            date = article.get("published", "")
+            
+            # Reuse results from a previous run for the same article
+            # Keyed by language too: the cached summary carries the language's section headers
+            cache_key = cache.llm_key(
+                "article", _ARTICLE_CACHE_PROMPT, self.llm, language_config.CONFIG.code,
+                original_title, article.get("link", ""), date
+            )
+            cached = cache.get(cache_key)
+            if cached is not None:
+                article.update(cached)
+                print(f"[{source}] Cached: {article['title'][:50]}...")
+                return None
+            
+            # Translate title to Spanish
+            translated_title = await self._translate_title(original_title)
+            article["title"] = translated_title
+            title = translated_title  # Use translated title for processing
+            
+            print(f"[{source}] Processing: {title[:50]}...")
+            
+            try:
+                # Use existing content if available, otherwise fetch with web search
+                existing_content = article.get("content", "")
+                if existing_content and existing_content.strip():
+                    original_content = existing_content
+                else:
+                    async with web_search_semaphore:
+                        original_content = await asummarize_article_with_web_search(title, article.get("link", ""), date, self.openai)
+                article["content"] = original_content
+                return cache_key
+                
+            except Exception as e:
+                print(f"Error processing article: {e}")
+                article["summary"] = f"Error: {str(e)}"
+                return None
     
     def process_extraction(self, extraction_data: extraction) -> extraction:
         """
         Process all articles: clean markdown and generate structured summaries.
         Updates articles in-place to maintain order.
+        
+        Raises:
+            RuntimeError: If called from a running event loop (Jupyter, async code),
+                use aprocess_extraction there
+        """
+        # Run on the shared loop so pooled async connections stay usable across calls
+        return run(self.aprocess_extraction(extraction_data))
+    
+    async def aprocess_extraction(self, extraction_data: extraction) -> extraction:
+        """
+        Async version of process_extraction, for callers that already run an event loop.
+        The shared async HTTP client binds to the first loop it is used on, so use either
+        this method or process_extraction within one process, not both.
         """
         collections = extraction_data.get("scraping", [])
         
@@ -308,12 +463,10 @@ class ArticleSummarizerAgent:
         print(f"{'='*60}\n")
         
         initial_state: AgentState = {
-            "extraction_data": extraction_data,
-            "collection_index": 0,
-            "article_index": 0
+            "extraction_data": extraction_data
         }
         
-        final_state = self.app.invoke(initial_state)
+        final_state = await self.app.ainvoke(initial_state)
         
         print(f"\n{'='*60}")
         print(f"✓ Completed processing")
@@ -0,0 +1,108 @@
+"""
+On-disk cache for LLM results, shared across scheduled runs.
+
+Keys are built by llm_key (BLAKE2b of the operation, prompt, model and inputs).
+"""
+import os
+import hashlib
+import inspect
+from functools import lru_cache, wraps
+from typing import Any, Callable, Optional
+from diskcache import Cache
+
+
+@lru_cache(maxsize=1)
+def _get_cache() -> Cache:
+    """Open the cache directory once per process."""
+    return Cache(os.getenv("AGENT_CACHE_DIR", ".cache/agent"))
+
+
+def _default_expire() -> Optional[float]:
+    """Default time-to-live in seconds (AGENT_CACHE_TTL, 7 days if unset, 0 disables expiry)."""
+    try:
+        ttl = float(os.getenv("AGENT_CACHE_TTL", "604800"))
+    except (ValueError, TypeError):
+        ttl = 604800.0
+    return ttl if ttl > 0 else None
+
+
+def get(key: str, default: Any = None) -> Any:
+    """Return the cached value for key, or default on a miss."""
+    return _get_cache().get(key, default)
+
+
+def put(key: str, value: Any, expire: Optional[float] = None) -> None:
+    """Store value under key, expiring after AGENT_CACHE_TTL seconds unless overridden."""
+    _get_cache().set(key, value, expire=expire if expire is not None else _default_expire())
+
+
+def llm_key(namespace: str, prompt: str, llm: Any, *inputs: Any) -> str:
+    """
+    Build the cache key of an LLM call from its prompt template, model and inputs.
+
+    Args:
+        namespace: Name of the cached operation ("clean", "summary"...)
+        prompt: Prompt template text, so editing a prompt invalidates its entries
+        llm: Chat model instance; its model_name is part of the key
+        *inputs: Values rendered into the prompt (title, content...)
+
+    Returns:
+        BLAKE2b hex digest of the namespace, prompt text, model and inputs
+    """
+    digest = hashlib.blake2b(digest_size=32)
+    for part in (namespace, prompt, getattr(llm, "model_name", ""), *inputs):
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def cached_llm(
+    namespace: str,
+    prompt: str,
+    dump: Optional[Callable[[Any], Any]] = None,
+    load: Optional[Callable[[Any], Any]] = None
+):
+    """
+    Cache the result of a function that calls an LLM, sync or async.
+
+    The decorated function takes its prompt inputs as positional arguments
+    followed by the llm. Results are only stored when the function returns;
+    exceptions propagate and leave the cache untouched.
+
+    Args:
+        namespace: Name of the cached operation
+        prompt: Prompt template text the function renders
+        dump: Converts the result to a plain value before storing (e.g. model_dump)
+        load: Rebuilds the result from the stored value
+
+    Returns:
+        Decorator
+    """
+    dump = dump or (lambda value: value)
+    load = load or (lambda value: value)
+
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args):
+                key = llm_key(namespace, prompt, args[-1], *args[:-1])
+                cached = get(key)
+                if cached is not None:
+                    return load(cached)
+                result = await func(*args)
+                put(key, dump(result))
+                return result
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args):
+            key = llm_key(namespace, prompt, args[-1], *args[:-1])
+            cached = get(key)
+            if cached is not None:
+                return load(cached)
+            result = func(*args)
+            put(key, dump(result))
+            return result
+        return wrapper
+
+    return decorator
@@ -0,0 +1,79 @@
+"""
+Local embedding ranker: scores articles by cosine similarity to a topic anchor.
+
+Used instead of the LLM ranker when RANK_MODE=embedding, and as a prefilter in
+front of it when RANK_MODE=hybrid. sentence-transformers is an optional dependency
+(requirements-embeddings.txt), only imported when one of these modes is used.
+"""
+import os
+from functools import lru_cache
+from typing import List
+
+DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+DEFAULT_RANK_ANCHOR = (
+    "Market-moving financial news: stock markets, technology companies, "
+    "artificial intelligence, startups, earnings and the global economy"
+)
+
+
+@lru_cache(maxsize=1)
+def _get_model():
+    """Load the sentence-transformers model once per process."""
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError as e:
+        raise ImportError(
+            "RANK_MODE=embedding/hybrid needs sentence-transformers: "
+            "pip install -r requirements-embeddings.txt"
+        ) from e
+    return SentenceTransformer(os.getenv("EMBEDDING_MODEL", DEFAULT_EMBEDDING_MODEL))
+
+
+@lru_cache(maxsize=8)
+def _get_anchor(text: str):
+    """Encode the topic anchor once per anchor text."""
+    return _get_model().encode([text], normalize_embeddings=True)
+
+
+def rank_articles_by_embedding(articles: List[dict], batch_size: int = 64) -> List[float]:
+    """
+    Rank articles by similarity to the RANK_ANCHOR topic description.
+
+    Args:
+        articles: Article dicts with title and content keys
+        batch_size: Number of texts encoded per model batch
+
+    Returns:
+        Ranking scores (0-100) in the same order as articles; 0.0 for
+        articles without title/content
+    """
+    if not articles:
+        return []
+
+    texts = [f"{article.get('title', '')}. {article.get('content', '')[:400]}" for article in articles]
+    vectors = _get_model().encode(texts, batch_size=batch_size, normalize_embeddings=True)
+    anchor = _get_anchor(os.getenv("RANK_ANCHOR") or DEFAULT_RANK_ANCHOR)
+    similarities = (vectors @ anchor.T).ravel()
+
+    # Cosine similarity in [-1, 1] mapped to the 0-100 scale used by the LLM ranker
+    return [
+        round(min(max(float(similarity), 0.0), 1.0) * 100, 2) if article.get("title") and article.get("content") else 0.0
+        for article, similarity in zip(articles, similarities)
+    ]
+
+
+def prefilter_by_embedding(articles: List[dict], top_k: int = 20) -> List[int]:
+    """
+    Select the articles worth sending to the LLM ranker.
+
+    Args:
+        articles: Article dicts with title and content keys
+        top_k: Maximum number of articles to keep
+
+    Returns:
+        Indices into articles of the top_k most on-topic articles, best first;
+        articles without title/content are never selected
+    """
+    scores = rank_articles_by_embedding(articles)
+    ranked = sorted((idx for idx, score in enumerate(scores) if score > 0), key=lambda idx: scores[idx], reverse=True)
+    return ranked[:top_k]
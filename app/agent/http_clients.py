@@ -0,0 +1,55 @@
+"""
+Shared HTTP clients for OpenAI and LangChain calls.
+
+Reusing one connection pool keeps TCP/TLS connections alive across LLM requests.
+The async client is bound to the event loop it first runs on, so async work is
+driven through run() on a single module-level loop instead of asyncio.run().
+"""
+import asyncio
+import atexit
+from typing import Any, Coroutine
+import httpx
+
+_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=32)
+
+SHARED_SYNC_CLIENT = httpx.Client(http2=True, limits=_LIMITS)
+SHARED_ASYNC_CLIENT = httpx.AsyncClient(http2=True, limits=_LIMITS)
+
+_LOOP = asyncio.new_event_loop()
+
+
+def run(coro: Coroutine[Any, Any, Any]) -> Any:
+    """
+    Run a coroutine to completion on the loop that owns SHARED_ASYNC_CLIENT.
+
+    Args:
+        coro: Coroutine to run
+
+    Returns:
+        The coroutine result
+
+    Raises:
+        RuntimeError: If called while an event loop is running in this thread (Jupyter
+            cell, async caller); those callers await the async API instead
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return _LOOP.run_until_complete(coro)
+    coro.close()
+    raise RuntimeError(
+        "run() cannot be called from a running event loop; await the async API instead "
+        "('await agent.aprocess_extraction(...)', 'await asummarize_article(...)')"
+    )
+
+
+def _close_clients():
+    """Close both clients and the shared loop at interpreter exit."""
+    SHARED_SYNC_CLIENT.close()
+    try:
+        _LOOP.run_until_complete(SHARED_ASYNC_CLIENT.aclose())
+    finally:
+        _LOOP.close()
+
+
+atexit.register(_close_clients)
@@ -3,9 +3,46 @@ Language configuration for the application.
 Supports ES (Spanish) and ENG (English) based on environment variable.
 """
 import os
-from dotenv import load_dotenv
+import sys
+from dataclasses import dataclass
+from collections import namedtuple
+from pathlib import Path
+from typing import Optional
 
-load_dotenv()
+# Project root .env, the file load_dotenv() found by walking up from this module
+_DOTENV_PATH = Path(__file__).resolve().parents[2] / ".env"
+
+# Set by the first bootstrap() call; module-level so subprocesses do not inherit it
+_BOOTSTRAPPED = False
+
+
+def bootstrap():
+    """
+    Load .env into the environment once per process.
+    Every module that reads settings at import (database connection, scrapers, agent)
+    calls it instead of load_dotenv(); only the first call parses the file.
+    python-dotenv is only imported when a .env file exists, deployments that set the
+    environment directly (Docker, Render) do not need it.
+    """
+    global _BOOTSTRAPPED
+    if _BOOTSTRAPPED:
+        return
+    _BOOTSTRAPPED = True
+    if _DOTENV_PATH.exists():
+        try:
+            from dotenv import load_dotenv
+        except ImportError:
+            print(f"⚠️  Warning: python-dotenv is not installed, ignoring {_DOTENV_PATH}")
+        else:
+            load_dotenv(_DOTENV_PATH)
+
+
+bootstrap()
+
+# Summary section keys, in display order. Interned so lookups with keys built at
+# runtime compare by identity against the literal keys below
+_HEADER_TYPES = tuple(sys.intern(k) for k in ("overview", "key_points", "why_it_matters", "simple_explanation"))
+_VALID_HEADER_TYPES = frozenset(_HEADER_TYPES)
 
 # Language configuration
 LANGUAGE_CONFIG = {
@@ -54,30 +91,101 @@ LANGUAGE_CONFIG = {
 }
 
 
+def _read_language() -> str:
+    """Read LANGUAGE from the environment, defaulting to 'ES' if not set or invalid."""
+    lang = os.getenv("LANGUAGE", "ES").upper()
+    if lang not in LANGUAGE_CONFIG:
+        # Default to ES if invalid
+        return "ES"
+    return lang
+
+
+# Resolved once at import, after .env has been loaded
+_LANG: str = _read_language()
+
+
 def get_language() -> str:
     """
     Get the language code from environment variable.
     Defaults to 'ES' if not set or invalid.
+    The value is read once at import.
     
     Returns:
         Language code: 'ES' or 'ENG'
     """
-    lang = os.getenv("LANGUAGE", "ES").upper()
-    if lang not in LANGUAGE_CONFIG:
-        # Default to ES if invalid
-        return "ES"
-    return lang
+    return _LANG
+
+
+# Section titles of one language, one field per entry of _HEADER_TYPES
+Headers = namedtuple("Headers", _HEADER_TYPES)
 
 
-def get_language_config() -> dict:
+@dataclass(frozen=True, slots=True)
+class LanguageConfig:
+    """Resolved configuration of one language, with attribute access to its fields."""
+    code: str
+    name: str
+    headers: Headers
+    display_headers: Headers
+    prompt_instructions: str
+    prompt_language_note: str
+    article_title_label: str
+    article_content_label: str
+    format_instruction: str
+    
+    @classmethod
+    def from_dict(cls, config: dict) -> "LanguageConfig":
+        """Build a config from a LANGUAGE_CONFIG entry, with the header maps as Headers tuples."""
+        return cls(**{
+            **config,
+            "headers": Headers(**config["headers"]),
+            "display_headers": Headers(**config["display_headers"])
+        })
+    
+    def header(self, header_type: str) -> str:
+        """Section header of this language, e.g. i18n.header("overview")."""
+        return getattr(self.headers, _validate_header_type(header_type))
+    
+    def display_header(self, header_type: str) -> str:
+        """Display header (for HTML) of this language."""
+        return getattr(self.display_headers, _validate_header_type(header_type))
+
+
+# Every language is resolved once at import; the active one cannot change during a run
+_CONFIGS = {lang: LanguageConfig.from_dict(config) for lang, config in LANGUAGE_CONFIG.items()}
+CONFIG = _CONFIGS[_LANG]
+# Public handle for consumers: from app.agent.language_config import i18n
+i18n = CONFIG
+
+# Flat (lang, kind, header_type) -> text table so header accessors do a single lookup.
+# "prefixed" is the "HEADER:" marker that starts a section in generated summaries
+_FLAT = {}
+for _lang, _config in _CONFIGS.items():
+    for _header_type in _HEADER_TYPES:
+        _FLAT[(_lang, "header", _header_type)] = getattr(_config.headers, _header_type)
+        _FLAT[(_lang, "display", _header_type)] = getattr(_config.display_headers, _header_type)
+        _FLAT[(_lang, "prefixed", _header_type)] = f"{getattr(_config.headers, _header_type)}:"
+del _lang, _config, _header_type
+
+
+def get_language_config(lang: Optional[str] = None) -> LanguageConfig:
     """
-    Get the full language configuration for the current language.
+    Get the full language configuration for a language.
+    
+    Args:
+        lang: Language code ('ES' or 'ENG'), defaults to the current language
     
     Returns:
-        Dictionary with language configuration
+        LanguageConfig with the language configuration
     """
-    lang = get_language()
-    return LANGUAGE_CONFIG[lang]
+    return CONFIG if lang is None else _CONFIGS[lang]
+
+
+def _validate_header_type(header_type: str) -> str:
+    """Return the interned header_type, raising KeyError for unknown sections instead of hiding typos."""
+    if header_type not in _VALID_HEADER_TYPES:
+        raise KeyError(header_type)
+    return sys.intern(header_type)
 
 
 def get_header(header_type: str) -> str:
@@ -89,9 +197,11 @@ def get_header(header_type: str) -> str:
     
     Returns:
         Header string in the current language
+    
+    Raises:
+        KeyError: If header_type is not a known section
     """
-    config = get_language_config()
-    return config["headers"].get(header_type, "")
+    return _FLAT[(_LANG, "header", _validate_header_type(header_type))]
 
 
 def get_display_header(header_type: str) -> str:
@@ -103,6 +213,25 @@ def get_display_header(header_type: str) -> str:
     
     Returns:
         Display header string in the current language
+    
+    Raises:
+        KeyError: If header_type is not a known section
+    """
+    return _FLAT[(_LANG, "display", _validate_header_type(header_type))]
+
+
+def get_prefixed_header(header_type: str, lang: Optional[str] = None) -> str:
+    """
+    Get the section marker ("HEADER:") that starts a section in a generated summary.
+    
+    Args:
+        header_type: One of 'overview', 'key_points', 'why_it_matters', 'simple_explanation'
+        lang: Language code ('ES' or 'ENG'), defaults to the current language
+    
+    Returns:
+        Precomputed header followed by a colon
+    
+    Raises:
+        KeyError: If header_type is not a known section
     """
-    config = get_language_config()
-    return config["display_headers"].get(header_type, "")
+    return _FLAT[(lang or _LANG, "prefixed", _validate_header_type(header_type))]
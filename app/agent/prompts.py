@@ -1,134 +1,82 @@
 """
 Prompts for article processing.
-"""
-import os
-from dotenv import load_dotenv
-from app.agent.language_config import get_language_config
-
-load_dotenv()
-
-MARKDOWN_CLEANER_PROMPT = """You are an expert content extractor. Clean the following markdown content by:
-
-1. Removing all navigation, headers, footers, sidebars, and advertisements
-2. Removing HTML tags, scripts, styles, and metadata
-3. Removing cookie notices, privacy policy links, and legal disclaimers
-4. Removing social media buttons and widgets
-5. Extracting ONLY the main article body content
-6. Preserving paragraphs, headings, and important formatting
-7. Removing duplicate content or repeated sections
-8. Keeping only text directly related to the article's main topic
-9. Preserving important data: numbers, percentages, dates, company names
-
-Return ONLY the cleaned content, no explanations.
-
-Markdown content:
-{content}
-
-Cleaned content:"""
-
-
-ARTICLE_SUMMARIZER_PROMPT = """You are a financial journalist creating a brief newsletter summary for people with NO financial background.
-
-**CRITICAL: Keep the entire summary to a MAXIMUM of 10 lines total. This is for a newsletter email.**
-
-Guidelines:
-- Use simple, everyday language. Avoid jargon or explain terms briefly.
-- Be concise and direct. Every word counts.
-- Focus on what happened, why it matters, and who is affected.
-- Prioritize the most important information only.
 
-**OUTPUT FORMAT (keep each section brief, total max 10 lines):**
-
-OVERVIEW: One-line summary of the main event.
-
-KEY POINTS: 2-3 bullet points with the most critical facts.
-• Bullet point the most important facts, announcements, or changes (aim for 3-6 points).
-• Only list points directly relevant to the article’s topic.
-
-WHY IT MATTERS: One sentence explaining relevance.
-
-SIMPLE EXPLANATION: 2-3 sentences in plain English.
-
----
-Article Title: {title}
-
-Article Content:
-{content}
-
-Produce a concise summary following the above structure. Maximum 10 lines total.
+Static prompts live in prompts.txt (one "###NAME" section each) and are loaded on
+first access through the module __getattr__ hook, e.g. prompts.MARKDOWN_CLEANER_PROMPT.
 """
+import os
+import hashlib
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict
+from app.agent.language_config import CONFIG, get_language_config
+
+_PROMPTS_FILE = Path(__file__).with_name("prompts.txt")
+_STATIC_PROMPTS: Dict[str, str] = {}
+
+
+def _load_static_prompts() -> Dict[str, str]:
+    """Parse prompts.txt into {NAME: text}; the newline closing each section is not part of the prompt."""
+    if not _STATIC_PROMPTS:
+        sections = {}
+        name, lines = None, []
+        with open(_PROMPTS_FILE, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("###"):
+                    if name is not None:
+                        sections[name] = "".join(lines)[:-1]
+                    name, lines = line[3:].strip(), []
+                else:
+                    lines.append(line)
+        if name is not None:
+            sections[name] = "".join(lines)[:-1]
+        _STATIC_PROMPTS.update(sections)
+    return _STATIC_PROMPTS
+
+
+def __getattr__(name: str) -> str:
+    """Resolve prompt constants lazily (PEP 562)."""
+    if name == "ARTICLE_SUMMARIZER_NEWSLETTER_PROMPT":
+        # Kept for backward compatibility, built for the current language on first access
+        value = globals()[name] = get_newsletter_prompt()
+        return value
+    prompts = _load_static_prompts()
+    if name in prompts:
+        return prompts[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@lru_cache(maxsize=32)
+def get_prompt_cache_key(prompt: str) -> str:
+    """
+    Get a stable key for the provider-side prompt cache, hashed once per prompt text.
+    
+    Args:
+        prompt: Static prompt prefix sent with every call
+    
+    Returns:
+        BLAKE2b hex digest (16 bytes) of the prompt
+    """
+    return hashlib.blake2b(prompt.encode("utf-8"), digest_size=16).hexdigest()
 
-ARTICLE_SUMMARIZER_PROMPT_WITH_WEB_SEARCH = """You are a financial research assistant specializing in gathering comprehensive information from financial news articles.
-
-**YOUR PRIMARY TASK:**
-Conduct thorough research on the provided article using web_search to collect all relevant information. Your goal is to gather comprehensive data that will be used by a specialized summarization agent in the next step.
-
-**RESEARCH OBJECTIVES:**
-1. Retrieve the complete article content from the provided URL
-2. Gather additional context and background information
-3. Identify key facts, figures, dates, and entities mentioned
-4. Collect related information that provides context to the article
-5. Note any important quotes, statistics, or data points
-
-**INSTRUCTIONS FOR WEB SEARCH:**
-- **Primary Search**: Use web_search to retrieve the full article content from: {url}
-  - Search using the exact URL or the article title: {title}
-  - Search using the article date: {date}
-  - Extract the complete article body, including all paragraphs and key information
-  - Capture all important details: dates, numbers, percentages, company names, people mentioned
-  
-- **Contextual Research**: If needed, perform additional searches to gather:
-  - Background information on key entities (companies, people, events) mentioned
-  - Related news or recent developments that provide context
-  - Definitions of technical terms or financial concepts used
-  - Historical context or previous related events
-
-**INFORMATION TO COLLECT:**
-- **Main Content**: The complete article text, properly extracted from the webpage
-- **Key Facts**: All important facts, announcements, numbers, dates, and statistics
-- **Entities**: Companies, people, organizations, and institutions mentioned
-- **Context**: Background information that helps understand the article's significance
-- **Related Information**: Any relevant context that enhances understanding
-
-**RESEARCH GUIDELINES:**
-- Be thorough and comprehensive - gather ALL relevant information
-- Extract the main article body, ignoring navigation, ads, sidebars, and promotional content
-- Preserve important formatting, structure, and data from the original article
-- If the article references other sources or events, note them for context
-- Collect information that will help explain complex financial concepts in simple terms later
-
-**OUTPUT FORMAT:**
-Provide a comprehensive research report containing:
-1. The complete article content (cleaned and extracted)
-2. All key facts, figures, and data points
-3. Important entities and their roles
-4. Contextual information that adds value
-5. Any additional relevant information discovered through research
-
-**IMPORTANT NOTES:**
-- Focus on RESEARCH and INFORMATION GATHERING, not on creating the final summary
-- A specialized summarization agent will process your research findings in the next step
-- Your job is to ensure all necessary information is collected and organized
-- Be thorough - it's better to collect too much information than to miss important details
-
----
-Article Title: {title}
-Article URL: {url}
-Article Date: {date}
-
-Begin your research by using web_search to retrieve and analyze the article content, then gather any additional contextual information that will be valuable for summarization.
-"""
 
-def get_newsletter_prompt() -> str:
+def get_newsletter_system_prompt() -> str:
     """
-    Get the newsletter summarizer prompt based on the current language setting.
+    Get the static newsletter summarizer instructions based on the current language setting.
+    They contain no article data, so every summary request starts with the same cacheable prefix.
     
     Returns:
-        Formatted prompt string in the configured language
+        Instructions in the configured language (no placeholders)
     """
-    config = get_language_config()
-    headers = config["headers"]
-    display_headers = config["display_headers"]
+    return _build_newsletter_system_prompt(CONFIG.code)
+
+
+@lru_cache(maxsize=8)
+def _build_newsletter_system_prompt(lang_code: str) -> str:
+    """Build the newsletter instructions once per language."""
+    config = get_language_config(lang_code)
+    headers = config.headers
+    display_headers = config.display_headers
     
     # Build the prompt dynamically based on language
     prompt = f"""
@@ -140,8 +88,8 @@ Your goal: explain what happened, why it matters, and how it connects — in sim
 ────────────────────────────────
 GLOBAL RULES (NON-NEGOTIABLE)
 ────────────────────────────────
-- {config["prompt_instructions"]}
-- {config["prompt_language_note"]}
+- {config.prompt_instructions}
+- {config.prompt_language_note}
 - Be concise, but never vague.
 - Remove anything that is not essential to understanding the story.
 - Assume the reader knows NOTHING about finance, tech, or companies.
@@ -178,10 +126,10 @@ COHERENCE & STORY FLOW (CRITICAL)
 ────────────────────────────────
 This is ONE story, not separate sections.
 
-- {headers["overview"]} defines the MAIN theme.
-- {headers["key_points"]} expand that SAME theme logically.
-- {headers["why_it_matters"]} explains real-world impact.
-- {headers["simple_explanation"]} ties everything together using the SAME words and ideas.
+- {headers.overview} defines the MAIN theme.
+- {headers.key_points} expand that SAME theme logically.
+- {headers.why_it_matters} explains real-world impact.
+- {headers.simple_explanation} ties everything together using the SAME words and ideas.
 
 Use consistent terminology throughout.
 Each section must clearly connect to the previous one.
@@ -189,24 +137,19 @@ Each section must clearly connect to the previous one.
 ────────────────────────────────
 OUTPUT FORMAT (STRICT — DO NOT CHANGE)
 ────────────────────────────────
-{headers["overview"]}: One short, punchy sentence stating the core theme. Include company context and explain any term immediately.
+{headers.overview}: One short, punchy sentence stating the core theme. Include company context and explain any term immediately.
 
-{headers["key_points"]}:
+{headers.key_points}:
 - 3–5 short bullets (aim for 4)
 - Logical progression of facts
 - Every company explained on first mention
 - Every technical term explained inline
 
-{headers["why_it_matters"]}: One short sentence explaining real-world impact, clearly tied to the overview.
-
-{headers["simple_explanation"]}: 1–2 very short sentences summarizing the entire story in plain language.
+{headers.why_it_matters}: One short sentence explaining real-world impact, clearly tied to the overview.
 
----
-{config["article_title_label"]}: {{title}}
-{config["article_content_label"]}:
-{{content}}
+{headers.simple_explanation}: 1–2 very short sentences summarizing the entire story in plain language.
 
-{config["format_instruction"]}
+{config.format_instruction}
 
 ────────────────────────────────
 FINAL CHECK (REQUIRED)
@@ -224,23 +167,49 @@ If your grandmother wouldn’t understand it, rewrite it.
     return prompt
 
 
-# For backward compatibility, create a variable that can be used directly
-# This will be evaluated at import time based on current language setting
-ARTICLE_SUMMARIZER_NEWSLETTER_PROMPT = get_newsletter_prompt()
+def get_newsletter_user_prompt() -> str:
+    """
+    Get the article part of the newsletter summarizer prompt, sent as the user message.
+    
+    Returns:
+        Template with {title} and {content} placeholders
+    """
+    return _build_newsletter_user_prompt(CONFIG.code)
 
 
-def get_article_ranking_prompt() -> str:
+@lru_cache(maxsize=8)
+def _build_newsletter_user_prompt(lang_code: str) -> str:
+    """Build the newsletter article template once per language."""
+    config = get_language_config(lang_code)
+    return f"""{config.article_title_label}: {{title}}
+{config.article_content_label}:
+{{content}}"""
+
+
+def get_newsletter_prompt() -> str:
     """
-    Get the article ranking prompt based on the current language setting.
+    Get the newsletter summarizer prompt based on the current language setting.
+    Single-template form of get_newsletter_system_prompt() + get_newsletter_user_prompt().
     
     Returns:
-        Formatted prompt string in the configured language for ranking articles
+        Formatted prompt string in the configured language
     """
-    config = get_language_config()
-    lang_code = config["code"]
+    return f"{get_newsletter_system_prompt()}\n---\n{get_newsletter_user_prompt()}"
+
+
+@lru_cache(maxsize=8)
+def _get_ranking_criteria(lang_code: str) -> str:
+    """
+    Get the ranking role and evaluation criteria shared by the single and batch ranking prompts.
+    
+    Args:
+        lang_code: Language code ('ES' or 'ENG')
     
+    Returns:
+        Ranking criteria text in the given language
+    """
     if lang_code == "ES":
-        prompt = """Eres un experto curador de contenido financiero especializado en identificar noticias que resuenen con profesionales jóvenes (20-35 años) que trabajan en corporativos y están interesados en tecnología, mercados de acciones, empresas innovadoras y crecimiento personal.
+        return """Eres un experto curador de contenido financiero especializado en identificar noticias que resuenen con profesionales jóvenes (20-35 años) que trabajan en corporativos y están interesados en tecnología, mercados de acciones, empresas innovadoras y crecimiento personal.
 
 **TU TAREA:**
 Evalúa el siguiente artículo y asigna un score de relevancia e interés de 0 a 100, donde:
@@ -292,17 +261,9 @@ Evalúa el siguiente artículo y asigna un score de relevancia e interés de 0 a
 - BUSCA contenido llamativo que resuene con profesionales jóvenes ambiciosos
 - DESCARTAR: contenido promocional obvio, rumores sin fundamento, noticias obsoletas (>1 semana), temas financieros tradicionales sin conexión tech
 - CONSIDERA el contexto: ¿esta noticia sería interesante para alguien de 25-30 años trabajando en tech/corporativo?
-- ASIGNA scores más altos a noticias que combinen múltiples criterios (ej: nueva herramienta AI de una startup que acaba de levantar capital)
-
-**ARTÍCULO A EVALUAR:**
-Título: {title}
-Fecha de Publicación: {published}
-URL: {link}
-Contenido: {content}
-
-Asigna un score de relevancia e interés de 0 a 100 para este artículo, considerando que la audiencia objetivo son profesionales jóvenes (20-35 años) interesados en tecnología, mercados de acciones, empresas innovadoras, AI, agentes y nuevas herramientas."""
-    else:  # ENG
-        prompt = """You are an expert content curator specializing in identifying financial news that resonates with young professionals (20-35 years old) who work in corporate environments and are interested in technology, stock markets, innovative companies, and personal growth.
+- ASIGNA scores más altos a noticias que combinen múltiples criterios (ej: nueva herramienta AI de una startup que acaba de levantar capital)"""
+    # ENG
+    return """You are an expert content curator specializing in identifying financial news that resonates with young professionals (20-35 years old) who work in corporate environments and are interested in technology, stock markets, innovative companies, and personal growth.
 
 **YOUR TASK:**
 Evaluate the following article and assign a relevance and interest score from 0 to 100, where:
@@ -354,9 +315,32 @@ Evaluate the following article and assign a relevance and interest score from 0
 - LOOK FOR catchy content that resonates with ambitious young professionals
 - DISCARD: obvious promotional content, unfounded rumors, obsolete news (>1 week old), traditional financial topics without tech connection
 - CONSIDER the context: would this news be interesting to someone 25-30 years old working in tech/corporate?
-- ASSIGN higher scores to news that combines multiple criteria (e.g., new AI tool from a startup that just raised capital)
+- ASSIGN higher scores to news that combines multiple criteria (e.g., new AI tool from a startup that just raised capital)"""
 
-**ARTICLE TO EVALUATE:**
+
+def get_article_ranking_prompt() -> str:
+    """
+    Get the article ranking prompt based on the current language setting.
+    
+    Returns:
+        Formatted prompt string in the configured language for ranking articles
+    """
+    return _build_article_ranking_prompt(CONFIG.code)
+
+
+@lru_cache(maxsize=8)
+def _build_article_ranking_prompt(lang_code: str) -> str:
+    """Build the single-article ranking prompt once per language."""
+    if lang_code == "ES":
+        article_block = """**ARTÍCULO A EVALUAR:**
+Título: {title}
+Fecha de Publicación: {published}
+URL: {link}
+Contenido: {content}
+
+Asigna un score de relevancia e interés de 0 a 100 para este artículo, considerando que la audiencia objetivo son profesionales jóvenes (20-35 años) interesados en tecnología, mercados de acciones, empresas innovadoras, AI, agentes y nuevas herramientas."""
+    else:  # ENG
+        article_block = """**ARTICLE TO EVALUATE:**
 Title: {title}
 Publication Date: {published}
 URL: {link}
@@ -364,4 +348,35 @@ Content: {content}
 
 Assign a relevance and interest score from 0 to 100 for this article, considering that the target audience is young professionals (20-35 years old) interested in technology, stock markets, innovative companies, AI, agents, and new tools."""
     
-    return prompt
\ No newline at end of file
+    return f"{_get_ranking_criteria(lang_code)}\n\n{article_block}"
+
+
+def get_article_batch_ranking_prompt() -> str:
+    """
+    Get the prompt to rank several articles in a single call, based on the current language setting.
+    
+    Returns:
+        Formatted prompt string with an {articles} placeholder for a JSON list of articles
+    """
+    return _build_article_batch_ranking_prompt(CONFIG.code)
+
+
+@lru_cache(maxsize=8)
+def _build_article_batch_ranking_prompt(lang_code: str) -> str:
+    """Build the batch ranking prompt once per language."""
+    if lang_code == "ES":
+        articles_block = """**ARTÍCULOS A EVALUAR:**
+Cada artículo incluye su índice (idx), título, fecha de publicación, URL, un extracto del contenido y dup_count (número de fuentes que publicaron la misma noticia; un valor alto indica una noticia ampliamente cubierta).
+
+{articles}
+
+Evalúa cada artículo por separado con los criterios anteriores y asigna a cada uno un score de relevancia e interés de 0 a 100. Devuelve exactamente un score por artículo usando su idx."""
+    else:  # ENG
+        articles_block = """**ARTICLES TO EVALUATE:**
+Each article includes its index (idx), title, publication date, URL, a content excerpt and dup_count (number of sources that carried the same story; a high value means the story is widely covered).
+
+{articles}
+
+Evaluate each article independently using the criteria above and assign each one a relevance and interest score from 0 to 100. Return exactly one score per article using its idx."""
+    
+    return f"{_get_ranking_criteria(lang_code)}\n\n{articles_block}"
@@ -32,6 +32,27 @@ class ArticleRank(BaseModel):
     )
 
 
+class ArticleRankItem(BaseModel):
+    """Ranking score for one article of a batch."""
+    
+    idx: int = Field(
+        description="Index (idx) of the article in the provided list"
+    )
+    score: float = Field(
+        description="Relevance and importance score from 0 to 100, where 100 is most relevant/important",
+        ge=0.0,
+        le=100.0
+    )
+
+
+class RankBatch(BaseModel):
+    """Ranking scores for a batch of financial articles."""
+    
+    scores: list[ArticleRankItem] = Field(
+        description="One ranking score per article, identified by its idx"
+    )
+
+
 class TitleTranslation(BaseModel):
     """Translated article title."""
     
@@ -0,0 +1,101 @@
+"""
+Reusable SMTP connections for sending newsletters.
+"""
+import atexit
+import smtplib
+import threading
+from typing import Dict, Tuple
+
+
+class SMTPSessionPool:
+    """Keeps authenticated SMTP_SSL connections alive per thread and reuses them across sends."""
+
+    def __init__(self, max_messages_per_connection: int = 100, timeout: float = 30):
+        """
+        Initialize the pool.
+
+        Args:
+            max_messages_per_connection: Messages sent on one connection before it is recycled
+            timeout: Socket timeout in seconds for new connections
+        """
+        self.max_messages_per_connection = max_messages_per_connection
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._open: set = set()
+
+    def _sessions(self) -> Dict[Tuple[str, int, str], list]:
+        """Get the {(host, port, user): [smtp, sent_count]} map of the current thread."""
+        if not hasattr(self._local, "sessions"):
+            self._local.sessions = {}
+        return self._local.sessions
+
+    @staticmethod
+    def _is_alive(smtp: smtplib.SMTP) -> bool:
+        """Check the connection with a NOOP."""
+        try:
+            return smtp.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def _close(self, smtp: smtplib.SMTP):
+        """Quit a connection, ignoring errors from already dropped sockets."""
+        with self._lock:
+            self._open.discard(smtp)
+        try:
+            smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            smtp.close()
+
+    def get(self, host: str, port: int, user: str, password: str) -> smtplib.SMTP:
+        """
+        Get a logged-in connection, reusing the current one if it still answers NOOP.
+
+        Args:
+            host: SMTP server host
+            port: SMTP server port (implicit TLS)
+            user: Login user
+            password: Login password
+
+        Returns:
+            Authenticated SMTP_SSL connection
+        """
+        key = (host, port, user)
+        sessions = self._sessions()
+        entry = sessions.get(key)
+        if entry is not None:
+            smtp, sent_count = entry
+            if sent_count < self.max_messages_per_connection and self._is_alive(smtp):
+                entry[1] += 1
+                return smtp
+            self._close(smtp)
+            del sessions[key]
+
+        smtp = smtplib.SMTP_SSL(host, port, timeout=self.timeout)
+        try:
+            smtp.login(user, password)
+        except Exception:
+            # Not pooled yet, so nothing else would ever close this socket
+            smtp.close()
+            raise
+        sessions[key] = [smtp, 1]
+        with self._lock:
+            self._open.add(smtp)
+        return smtp
+
+    def discard(self, host: str, port: int, user: str):
+        """Drop the current thread's connection for (host, port, user) so the next get() reconnects."""
+        entry = self._sessions().pop((host, port, user), None)
+        if entry is not None:
+            self._close(entry[0])
+
+    def close_all(self):
+        """Close every open connection from all threads."""
+        with self._lock:
+            open_sessions = list(self._open)
+        for smtp in open_sessions:
+            self._close(smtp)
+
+
+pool = SMTPSessionPool()
+atexit.register(pool.close_all)
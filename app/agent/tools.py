@@ -1,6 +1,8 @@
 """
 Tools for article processing: markdown cleaning and summarization.
 """
+from __future__ import annotations
+
 import sys
 from pathlib import Path
 # Add project root to path
@@ -8,20 +10,142 @@ project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
 import os
+import re
+import json
+import asyncio
 import smtplib
 from pathlib import Path
 from datetime import datetime
-from typing import List
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
 from app.database.db_manager import DatabaseManager
 from email.mime.text import MIMEText
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_openai import ChatOpenAI
-from openai import OpenAI
-from app.agent.schemas import ArticleSummary, ArticleRank
-from app.agent.prompts import MARKDOWN_CLEANER_PROMPT, ARTICLE_SUMMARIZER_PROMPT, ARTICLE_SUMMARIZER_PROMPT_WITH_WEB_SEARCH, get_newsletter_prompt, get_article_ranking_prompt
-from dotenv import load_dotenv
-from jinja2 import Template
-load_dotenv()
+from app.agent.schemas import ArticleSummary, ArticleRank, RankBatch
+from app.agent import cache
+from app.agent.smtp_pool import pool as smtp_pool
+from app.agent.http_clients import run
+from app.agent.prompts import MARKDOWN_CLEANER_PROMPT, MARKDOWN_CLEANER_INPUT, ARTICLE_SUMMARIZER_PROMPT_WITH_WEB_SEARCH, ARTICLE_SUMMARIZER_WEB_SEARCH_INPUT, get_newsletter_system_prompt, get_newsletter_user_prompt, get_article_ranking_prompt, get_article_batch_ranking_prompt, get_prompt_cache_key
+from app.agent.language_config import CONFIG, bootstrap
+from jinja2 import Environment, FileSystemLoader
+bootstrap()
+
+if TYPE_CHECKING:
+    # Only needed for annotations, the clients are created by the agent
+    from langchain_openai import ChatOpenAI
+    from openai import AsyncOpenAI
+
+# Prompt templates are parsed once, the language cannot change during a run
+# Static instructions go in the system message, only the article data varies per call
+_CLEAN_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", MARKDOWN_CLEANER_PROMPT),
+    ("human", MARKDOWN_CLEANER_INPUT)
+])
+_SUMMARY_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", get_newsletter_system_prompt()),
+    ("human", get_newsletter_user_prompt())
+])
+_RANK_PROMPT = ChatPromptTemplate.from_template(get_article_ranking_prompt())
+_RANK_BATCH_PROMPT = ChatPromptTemplate.from_template(get_article_batch_ranking_prompt())
+
+# Email templates are compiled on first use and kept for the life of the process
+_TEMPLATES_DIR = Path(__file__).parent.parent / 'templates'
+_TEMPLATE_ENV = Environment(loader=FileSystemLoader(str(_TEMPLATES_DIR)), auto_reload=False, cache_size=400)
+
+# Chains built per llm instance, keyed by (id(llm), name). The llm is stored next to
+# its chain so the id cannot be reused by another object while the entry exists
+_CHAINS: Dict[Tuple[int, str], Tuple[Any, Any]] = {}
+
+
+def _resilient_chain(llm: ChatOpenAI, build: Callable[[ChatOpenAI], Any]):
+    """
+    Build a chain that retries transient API errors and can fall back to another model.
+    
+    Rate limits, timeouts and connection errors are retried up to 3 times with jittered
+    exponential backoff. If FALLBACK_MODEL is set, the same chain built on that model
+    runs when the primary one still fails.
+    
+    Args:
+        llm: ChatOpenAI instance of the primary chain
+        build: Builds the chain on a given model
+        
+    Returns:
+        Runnable wrapped with retry and fallback
+    """
+    import openai
+    
+    chain = build(llm).with_retry(
+        retry_if_exception_type=(openai.RateLimitError, openai.APITimeoutError, openai.APIConnectionError),
+        wait_exponential_jitter=True,
+        stop_after_attempt=3
+    )
+    fallback_model = os.getenv("FALLBACK_MODEL")
+    if fallback_model and fallback_model != llm.model_name:
+        chain = chain.with_fallbacks([build(llm.model_copy(update={"model_name": fallback_model}))])
+    return chain
+
+
+def _cached_chain(name: str, llm: ChatOpenAI, build: Callable[[ChatOpenAI], Any]):
+    """Return the chain called name for llm, building it (with retry and fallback) on first use."""
+    key = (id(llm), name)
+    entry = _CHAINS.get(key)
+    if entry is None or entry[0] is not llm:
+        entry = _CHAINS[key] = (llm, _resilient_chain(llm, build))
+    return entry[1]
+
+
+# Markup that never belongs to the article body, stripped locally before the LLM sees it
+_BOILERPLATE_RE = re.compile(r"<script.*?</script>|<style.*?</style>|<!--.*?-->", re.S | re.I)
+_BLANK_LINES_RE = re.compile(r"\n\s*\n\s*\n+")
+_SPACES_RE = re.compile(r"[ \t]{2,}")
+_TAG_RE = re.compile(r"<[^>]+>")
+# ~4k tokens per cleaning request; longer articles are split on paragraph boundaries
+CLEAN_CHUNK_CHARS = 16000
+# Short content with almost no leftover markup is returned as is, without an LLM call
+LOCAL_CLEAN_MAX_CHARS = 2000
+LOCAL_CLEAN_MAX_TAG_RATIO = 0.005
+
+
+def _strip_boilerplate(content: str) -> str:
+    """Remove scripts, styles and comments and collapse repeated whitespace."""
+    content = _BOILERPLATE_RE.sub("", content)
+    content = _SPACES_RE.sub(" ", content)
+    return _BLANK_LINES_RE.sub("\n\n", content).strip()
+
+
+def _is_clean(content: str) -> bool:
+    """True when content is short and has (almost) no HTML tags left, so the LLM cannot improve it much."""
+    if len(content) >= LOCAL_CLEAN_MAX_CHARS:
+        return False
+    return len(_TAG_RE.findall(content)) / max(len(content), 1) < LOCAL_CLEAN_MAX_TAG_RATIO
+
+
+def _split_chunks(content: str, max_chars: int = CLEAN_CHUNK_CHARS) -> List[str]:
+    """Split content into chunks of at most max_chars, cutting between paragraphs when possible."""
+    chunks = []
+    while len(content) > max_chars:
+        cut = content.rfind("\n\n", 0, max_chars)
+        if cut <= 0:
+            cut = max_chars
+        chunks.append(content[:cut])
+        content = content[cut:].lstrip()
+    if content:
+        chunks.append(content)
+    return chunks
+
+
+@cache.cached_llm("clean", MARKDOWN_CLEANER_PROMPT + MARKDOWN_CLEANER_INPUT)
+def _clean_with_llm(content: str, llm: ChatOpenAI) -> str:
+    """Clean pre-stripped content with the LLM, one request per chunk. Raises on API errors."""
+    chain = _cached_chain(
+        "clean", llm,
+        lambda model: _CLEAN_PROMPT | model.bind(prompt_cache_key=get_prompt_cache_key(MARKDOWN_CLEANER_PROMPT))
+    )
+    chunks = _split_chunks(content)
+    if len(chunks) == 1:
+        return chain.invoke({"content": content}).content.strip()
+    responses = chain.batch([{"content": chunk} for chunk in chunks])
+    return "\n\n".join(response.content.strip() for response in responses)
+
 
 def clean_markdown(content: str, llm: ChatOpenAI) -> str:
     """
@@ -37,20 +161,57 @@ def clean_markdown(content: str, llm: ChatOpenAI) -> str:
     if not content:
         return ""
     
-    prompt = ChatPromptTemplate.from_template(MARKDOWN_CLEANER_PROMPT)
-    chain = prompt | llm
+    content = _strip_boilerplate(content)
+    if not content or _is_clean(content):
+        return content
     
     try:
-        response = chain.invoke({"content": content})
-        return response.content.strip()
+        return _clean_with_llm(content, llm)
     except Exception as e:
         print(f"Error cleaning markdown: {e}")
         return content
 
 
+def _empty_summary() -> ArticleSummary:
+    """Placeholder summary for articles without content."""
+    return ArticleSummary(
+        overview="No content available",
+        key_points=[],
+        why_it_matters="Unable to summarize",
+        simple_explanation="No content available to summarize."
+    )
+
+
+def _failed_summary(error: Exception) -> ArticleSummary:
+    """Placeholder summary for articles whose summarization call failed."""
+    print(f"Error summarizing: {error}")
+    return ArticleSummary(
+        overview="Summary generation failed",
+        key_points=["Error occurred during summarization"],
+        why_it_matters="Unable to determine",
+        simple_explanation=f"Error: {str(error)}"
+    )
+
+
+def _summary_chain(llm: ChatOpenAI):
+    """Prompt and structured-output model for newsletter summaries in the current language."""
+    return _cached_chain("summary", llm, lambda model: _SUMMARY_PROMPT | model.with_structured_output(ArticleSummary))
+
+
+# Summaries are cached by prompt, model and article text. summarize_article goes
+# through summarize_articles_batch, so the key and serialization live in one place
+_SUMMARY_CACHE_PROMPT = get_newsletter_system_prompt() + get_newsletter_user_prompt()
+
+
+def _summary_cache_key(title: str, content: str, llm: ChatOpenAI) -> str:
+    """Cache key of the summary of one article."""
+    return cache.llm_key("summary", _SUMMARY_CACHE_PROMPT, llm, title, content)
+
+
 def summarize_article(title: str, content: str, llm: ChatOpenAI) -> ArticleSummary:
     """
     Generate structured summary of an article for non-expert readers.
+    Synchronous wrapper of asummarize_article; from async code await that instead.
     
     Args:
         title: Article title
@@ -60,33 +221,68 @@ def summarize_article(title: str, content: str, llm: ChatOpenAI) -> ArticleSumma
     Returns:
         ArticleSummary object with structured summary
     """
-    if not content:
-        return ArticleSummary(
-            overview="No content available",
-            key_points=[],
-            why_it_matters="Unable to summarize",
-            simple_explanation="No content available to summarize."
-        )
+    return run(asummarize_article(title, content, llm))
+
+
+async def asummarize_article(title: str, content: str, llm: ChatOpenAI) -> ArticleSummary:
+    """
+    Async version of summarize_article.
     
-    # Get prompt based on current language setting
-    prompt_template = get_newsletter_prompt()
-    prompt = ChatPromptTemplate.from_template(prompt_template)
+    Args:
+        title: Article title
+        content: Article content (should be cleaned markdown)
+        llm: ChatOpenAI instance to use for summarization
+        
+    Returns:
+        ArticleSummary object with structured summary
+    """
+    summary, _ = (await summarize_articles_batch([(title, content)], llm))[0]
+    return summary
+
+
+async def summarize_articles_batch(
+    items: List[Tuple[str, str]], llm: ChatOpenAI, max_concurrency: int = 16
+) -> List[Tuple[ArticleSummary, bool]]:
+    """
+    Generate structured summaries for several articles with one batched chain call.
     
-    # Use structured output with Pydantic
-    structured_llm = llm.with_structured_output(ArticleSummary)
-    chain = prompt | structured_llm
+    Args:
+        items: (title, content) pairs to summarize
+        llm: ChatOpenAI instance to use for summarization
+        max_concurrency: Maximum number of summarization requests in flight
+        
+    Returns:
+        (summary, ok) pairs in the same order as items. ok is False when summary is a
+        placeholder (no content, or the LLM call failed) that must not be cached
+    """
+    summaries: List[Optional[Tuple[ArticleSummary, bool]]] = [None] * len(items)
+    pending = []
+    for idx, (title, content) in enumerate(items):
+        if not content:
+            summaries[idx] = (_empty_summary(), False)
+            continue
+        cached = cache.get(_summary_cache_key(title, content, llm))
+        if cached is not None:
+            summaries[idx] = (ArticleSummary.model_validate(cached), True)
+        else:
+            pending.append(idx)
     
-    try:
-        summary = chain.invoke({"title": title, "content": content})
-        return summary
-    except Exception as e:
-        print(f"Error summarizing: {e}")
-        return ArticleSummary(
-            overview="Summary generation failed",
-            key_points=["Error occurred during summarization"],
-            why_it_matters="Unable to determine",
-            simple_explanation=f"Error: {str(e)}"
+    if pending:
+        results = await _summary_chain(llm).abatch(
+            [{"title": items[idx][0], "content": items[idx][1]} for idx in pending],
+            config={"max_concurrency": max(max_concurrency, 1)},
+            return_exceptions=True
         )
+        for idx, result in zip(pending, results):
+            if isinstance(result, Exception):
+                summaries[idx] = (_failed_summary(result), False)
+                continue
+            summaries[idx] = (result, True)
+            title, content = items[idx]
+            cache.put(_summary_cache_key(title, content, llm), result.model_dump())
+    
+    return summaries
+
 
 def rank_article(title: str, content: str, link: str, published: str, llm: ChatOpenAI) -> float:
     """
@@ -105,13 +301,14 @@ def rank_article(title: str, content: str, link: str, published: str, llm: ChatO
     if not content or not title:
         return 0.0
     
-    # Get prompt based on current language setting
-    prompt_template = get_article_ranking_prompt()
-    prompt = ChatPromptTemplate.from_template(prompt_template)
+    # Scores are deterministic per (prompt, model, language, title, content), reuse previous runs
+    cache_key = _rank_cache_key(title, content, llm)
+    cached_score = cache.get(cache_key)
+    if cached_score is not None:
+        return cached_score
     
     # Use structured output with Pydantic
-    structured_llm = llm.with_structured_output(ArticleRank)
-    chain = prompt | structured_llm
+    chain = _cached_chain("rank", llm, lambda model: _RANK_PROMPT | model.with_structured_output(ArticleRank))
     
     try:
         rank_result = chain.invoke({
@@ -120,28 +317,119 @@ def rank_article(title: str, content: str, link: str, published: str, llm: ChatO
             "link": link,
             "published": published
         })
+        cache.put(cache_key, rank_result.score)
         return rank_result.score
     except Exception as e:
         print(f"Error ranking article '{title[:50]}...': {e}")
         return 0.0
 
 
-def summarize_article_with_web_search(title: str, url: str, date: str,llm: OpenAI) -> ArticleSummary:
+# Scores are cached by both ranking prompts, shared by single and batch calls
+_RANK_CACHE_PROMPT = get_article_ranking_prompt() + get_article_batch_ranking_prompt()
+
+
+def _rank_cache_key(title: str, content: str, llm: ChatOpenAI, dup_count: int = 1) -> str:
+    """Cache key shared by single and batch ranking; dup_count is sent to the batch ranker."""
+    return cache.llm_key("rank", _RANK_CACHE_PROMPT, llm, CONFIG.code, title, content, dup_count)
+
+
+async def _rank_chunk(articles: List[dict], indices: List[int], llm: ChatOpenAI) -> dict:
+    """Rank a chunk of articles in a single LLM call, returning {index: score}."""
+    payload = json.dumps([
+        {
+            "idx": idx,
+            "title": articles[idx].get("title", ""),
+            "published": articles[idx].get("published", ""),
+            "link": articles[idx].get("link", ""),
+            "dup_count": articles[idx].get("dup_count", 1),
+            "content": articles[idx].get("content", "")[:500]
+        }
+        for idx in indices
+    ], ensure_ascii=False, indent=2)
+    
+    chain = _cached_chain("rank_batch", llm, lambda model: _RANK_BATCH_PROMPT | model.with_structured_output(RankBatch))
+    
+    try:
+        result = await chain.ainvoke({"articles": payload})
+    except Exception as e:
+        print(f"Error ranking batch of {len(indices)} articles: {e}")
+        return {}
+    
+    valid = set(indices)
+    return {item.idx: item.score for item in result.scores if item.idx in valid}
+
+
+async def rank_articles_batch(articles: List[dict], llm: ChatOpenAI, batch_size: int = 20) -> List[float]:
     """
-    Generate structured summary of an article for non-expert readers.
+    Rank several articles with one LLM call per chunk of batch_size articles.
+    
+    Args:
+        articles: Article dicts with title, content, link and published keys
+        llm: ChatOpenAI instance to use for ranking
+        batch_size: Maximum number of articles per LLM call
+        
+    Returns:
+        Ranking scores (0-100) in the same order as articles; 0.0 for
+        articles without title/content or that could not be ranked
+    """
+    scores = [0.0] * len(articles)
+    pending = []
+    for idx, article in enumerate(articles):
+        title = article.get("title", "")
+        content = article.get("content", "")
+        if not content or not title:
+            continue
+        cached_score = cache.get(_rank_cache_key(title, content, llm, article.get("dup_count", 1)))
+        if cached_score is not None:
+            scores[idx] = cached_score
+        else:
+            pending.append(idx)
+    
+    chunks = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+    results = await asyncio.gather(*(_rank_chunk(articles, chunk, llm) for chunk in chunks))
+    
+    for chunk_scores in results:
+        for idx, score in chunk_scores.items():
+            scores[idx] = score
+            article = articles[idx]
+            cache.put(_rank_cache_key(
+                article.get("title", ""), article.get("content", ""), llm, article.get("dup_count", 1)
+            ), score)
+    
+    return scores
+
+
+def summarize_article_with_web_search(title: str, url: str, date: str, llm: AsyncOpenAI) -> str:
+    """
+    Research an article with OpenAI web search to recover its content.
+    Synchronous wrapper of asummarize_article_with_web_search; from async code await that instead.
     
     Args:
         title: Article title
-        URL: Article URL
-        llm: ChatOpenAI instance to use for summarization
+        url: Article URL
+        date: Publication date
+        llm: AsyncOpenAI client to use for the Responses API call
         
     Returns:
-        ArticleSummary object with structured summary
+        Research report text with the article content and context
     """
-    title = f"Article Title: {title}"
-    url = f"Article URL: {url}"
+    return run(asummarize_article_with_web_search(title, url, date, llm))
+
 
-    response = llm.responses.create(
+async def asummarize_article_with_web_search(title: str, url: str, date: str, llm: AsyncOpenAI) -> str:
+    """
+    Research an article with OpenAI web search to recover its content.
+    
+    Args:
+        title: Article title
+        url: Article URL
+        date: Publication date
+        llm: AsyncOpenAI client to use for the Responses API call
+        
+    Returns:
+        Research report text with the article content and context
+    """
+    response = await llm.responses.create(
         model=os.getenv("WEB_SEARCH_MODEL"),
         reasoning={"effort": "low"},
         tools=[
@@ -149,10 +437,12 @@ def summarize_article_with_web_search(title: str, url: str, date: str,llm: OpenA
                 "type": "web_search",
             }
         ],
-        instructions=ARTICLE_SUMMARIZER_PROMPT_WITH_WEB_SEARCH.format(title=title, url=url, date=date),
-        input=title,
+        # Static instructions first so the provider can cache them across articles
+        instructions=ARTICLE_SUMMARIZER_PROMPT_WITH_WEB_SEARCH,
+        input=ARTICLE_SUMMARIZER_WEB_SEARCH_INPUT.format(title=title, url=url, date=date),
         tool_choice="required",
-        include=["web_search_call.action.sources"]
+        include=["web_search_call.action.sources"],
+        prompt_cache_key=get_prompt_cache_key(ARTICLE_SUMMARIZER_PROMPT_WITH_WEB_SEARCH)
     )
     return response.output_text
 
@@ -182,8 +472,10 @@ def send_email_with_content(items: List[dict], recipients: List[str]) -> bool:
         ValueError: If required environment variables are not set
     """
     # Get configuration from environment variables
+    # Subject and template date share one timestamp
+    now = datetime.now()
     subject_base = os.getenv("EMAIL_SUBJECT")
-    subject = f"{subject_base} {datetime.now().strftime('%Y-%m-%d')}" if subject_base else None
+    subject = f"{subject_base} {now:%Y-%m-%d}" if subject_base else None
     sender = os.getenv("EMAIL_SENDER")
     password = os.getenv("EMAIL_PASSWORD")
     
@@ -220,25 +512,22 @@ def send_email_with_content(items: List[dict], recipients: List[str]) -> bool:
     
     try:
         # Get the template path
-        template_path = Path(__file__).parent.parent / 'templates' / 'template.html'
+        template_path = _TEMPLATES_DIR / 'template.html'
         
         if not template_path.exists():
             raise FileNotFoundError(f"Template not found at {template_path}")
         
-        # Read and compile the template
-        with open(template_path, 'r', encoding='utf-8') as f:
-            template_content = f.read()
-        
-        template = Template(template_content)
+        # Compiled once per process by the shared environment
+        template = _TEMPLATE_ENV.get_template('template.html')
         
         # Render the template with DATE and news_items
         html_msg = template.render(
-            DATE=datetime.now().strftime("%A, %B %d, %Y"),
+            DATE=f"{now:%A, %B %d, %Y}",
             news_items=items
         )
         
         # Create email message
-        msg = MIMEText(html_msg, 'html')
+        msg = MIMEText(html_msg, 'html', 'utf-8')
         msg['Subject'] = subject
         msg['From'] = sender
         # Set To field to sender to hide recipient list
@@ -248,10 +537,16 @@ def send_email_with_content(items: List[dict], recipients: List[str]) -> bool:
         # Send email using Gmail SMTP
         # Using BCC: recipients are included in sendmail() but won't appear in email headers
         # This ensures recipients cannot see each other's email addresses
-        with smtplib.SMTP_SSL('smtp.gmail.com', 465) as smtp_server:
-            smtp_server.login(sender, password)
+        # The connection is pooled and reused by later sends in the same process
+        smtp_server = smtp_pool.get('smtp.gmail.com', 465, sender, password)
+        try:
             # All recipients receive the email, but their addresses are hidden from each other
             smtp_server.sendmail(sender, recipients, msg.as_string())
+        except smtplib.SMTPServerDisconnected:
+            # Server dropped the pooled connection, reconnect once
+            smtp_pool.discard('smtp.gmail.com', 465, sender)
+            smtp_server = smtp_pool.get('smtp.gmail.com', 465, sender, password)
+            smtp_server.sendmail(sender, recipients, msg.as_string())
         
         print(f"✓ Email sent successfully to {len(recipients)} recipient(s)")
         return True
@@ -1,9 +1,10 @@
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
-from dotenv import load_dotenv
+from sqlalchemy.pool import StaticPool
+from app.agent.language_config import bootstrap
 
-load_dotenv()
+bootstrap()
 
 
 def get_database_url() -> str:
@@ -28,6 +29,56 @@ def get_database_url() -> str:
     return "sqlite:///rss_articles.db"
 
 
+def _env_int(name: str, default: int) -> int:
+    """Read an integer setting from the environment, warning and using default if invalid."""
+    try:
+        return int(os.getenv(name, str(default)))
+    except (ValueError, TypeError):
+        print(f"⚠️  Warning: {name} env var is invalid, using default value: {default}")
+        return default
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Tune every new SQLite connection: WAL journaling for faster, non-blocking writes,
+    plus memory-mapped reads (SQLITE_MMAP_SIZE bytes) and a larger page cache
+    (SQLITE_CACHE_SIZE, negative values are KiB) for the read queries.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA mmap_size={_env_int('SQLITE_MMAP_SIZE', 268435456)}")
+    cursor.execute(f"PRAGMA cache_size={_env_int('SQLITE_CACHE_SIZE', -65536)}")
+    cursor.close()
+
+
+def _engine_kwargs(database_url: str) -> dict:
+    """
+    Pool settings for the database behind database_url.
+    
+    Args:
+        database_url: SQLAlchemy database URL
+        
+    Returns:
+        Keyword arguments for create_engine
+    """
+    if database_url.startswith("sqlite"):
+        kwargs = {"connect_args": {"check_same_thread": False}}
+        # An in-memory database only exists inside its connection, so every session must share it
+        if database_url in ("sqlite://", "sqlite:///:memory:"):
+            kwargs["poolclass"] = StaticPool
+        return kwargs
+    
+    # Server databases: keep enough warm connections for the concurrent workers and
+    # replace connections the server (or a proxy) closed while idle
+    return {
+        "pool_size": _env_int("DB_POOL_SIZE", 20),
+        "max_overflow": _env_int("DB_MAX_OVERFLOW", 10),
+        "pool_recycle": _env_int("DB_POOL_RECYCLE", 1800),
+        "pool_pre_ping": True,
+    }
+
+
 def create_engine_instance(database_url: str = None):
     """
     Create SQLAlchemy engine instance.
@@ -42,7 +93,10 @@ def create_engine_instance(database_url: str = None):
         database_url = get_database_url()
     
     try:
-        return create_engine(database_url, echo=False)
+        # executemany INSERTs are sent as multi-row statements of at most 1000 rows
+        engine = create_engine(
+            database_url, echo=False, insertmanyvalues_page_size=1000, **_engine_kwargs(database_url)
+        )
     except Exception as e:
         if "psycopg2" in str(e) or "psycopg" in str(e):
             raise ImportError(
@@ -50,6 +104,10 @@ def create_engine_instance(database_url: str = None):
                 "Or ensure PostgreSQL environment variables are not set to use SQLite."
             ) from e
         raise
+    
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+    return engine
 
 
 # Create engine and session factory
@@ -1,10 +1,209 @@
-from typing import Optional, List
+import re
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, Iterator, Optional, List, Tuple
 from datetime import datetime, date
-from sqlalchemy import text
+from sqlalchemy import bindparam, func, insert, inspect, select, text, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import load_only
 from app.database.connection import get_engine, get_session
 from app.database.models import Base, Article, Collection, Extraction
 from app.scrapers.rss_scraper import extraction as ExtractionType
 
+# Rows fetched per round-trip when streaming article queries
+ARTICLE_BATCH_SIZE = 500
+# Rows fetched per round-trip when streaming today's news
+TODAY_NEWS_BATCH_SIZE = 200
+# Article rows per upsert statement in insert_extraction, same as the engine's insertmanyvalues page
+ARTICLE_WRITE_BATCH_SIZE = 1000
+
+# Refresh of an existing article, executed once for all of them (executemany).
+# Empty values keep the stored ones, like the per-article updates did
+_articles = Article.__table__
+_UPDATE_ARTICLE_STMT = (
+    update(_articles)
+    .where(_articles.c.id == bindparam("b_id"))
+    .values(
+        title=func.coalesce(func.nullif(bindparam("b_title"), ""), _articles.c.title),
+        summary=func.coalesce(func.nullif(bindparam("b_summary"), ""), _articles.c.summary),
+        content=func.coalesce(func.nullif(bindparam("b_content"), ""), _articles.c.content),
+        source=func.coalesce(func.nullif(bindparam("b_source"), ""), _articles.c.source)
+    )
+)
+
+# Plain executemany insert of new articles, no RETURNING of generated columns
+_INSERT_ARTICLE_STMT = insert(_articles).execution_options(return_defaults=False)
+
+# The emails table is managed outside the models, so it is queried with raw SQL.
+# Built once so every call reuses the same statement object
+_EMAILS_STMT = text("SELECT email FROM emails")
+
+# aggregate_today_news results per (day, language), shared by every DatabaseManager
+# of the process and dropped whenever an extraction is inserted
+TODAY_NEWS_CACHE_TTL = 300
+_today_news_cache: Dict[Tuple[date, str], Tuple[float, List[dict]]] = {}
+
+# Collection.article_count recomputed from the articles table, for every collection
+# or (with .where) only those touched by an extraction
+_REFRESH_ARTICLE_COUNTS_STMT = update(Collection.__table__).values(
+    article_count=select(func.count(_articles.c.id))
+    .where(_articles.c.collection_id == Collection.__table__.c.id)
+    .scalar_subquery()
+)
+
+# Upsert statements of one dialect: collections by source (RETURNING source, id) and articles by link
+UpsertStatements = namedtuple("UpsertStatements", ("collections", "articles"))
+
+
+def _build_upserts(dialect_insert) -> UpsertStatements:
+    """
+    INSERT ... ON CONFLICT statements of insert_extraction for one dialect.
+    
+    Args:
+        dialect_insert: postgresql.insert or sqlite.insert
+    
+    Returns:
+        UpsertStatements, executed with a list of row parameters (executemany)
+    """
+    collections = Collection.__table__
+    collections_stmt = dialect_insert(collections)
+    collections_stmt = collections_stmt.on_conflict_do_update(
+        index_elements=["source"],
+        # excluded.updated_at is the insert default of the row, i.e. the time of this upsert
+        set_={
+            "extraction_id": collections_stmt.excluded.extraction_id,
+            "updated_at": collections_stmt.excluded.updated_at
+        }
+    ).returning(collections.c.source, collections.c.id)
+
+    # Existing articles keep their stored values where the new ones are empty
+    articles_stmt = dialect_insert(_articles)
+    articles_stmt = articles_stmt.on_conflict_do_update(
+        index_elements=["link"],
+        set_={
+            field: func.coalesce(func.nullif(getattr(articles_stmt.excluded, field), ""), _articles.c[field])
+            for field in ("title", "summary", "content", "source")
+        }
+    )
+    return UpsertStatements(collections=collections_stmt, articles=articles_stmt)
+
+
+# Dialects with INSERT ... ON CONFLICT, used to upsert without reading first. The
+# statements are built once so every extraction hits the same compiled-statement cache entry
+_UPSERT_STATEMENTS = {
+    "postgresql": _build_upserts(postgresql.insert),
+    "sqlite": _build_upserts(sqlite.insert)
+}
+
+
+def _merge_article_fields(row: dict, article_data: dict, article_source: str):
+    """Copy the non-empty title, summary, content and source of article_data into row."""
+    for field in ("title", "summary", "content"):
+        if article_data.get(field):
+            row[field] = article_data[field]
+    if article_source:
+        row["source"] = article_source
+
+
+_BLANK_LINE_RE = re.compile(r"\n[ \t]*\n")
+_LINE_BREAK_RE = re.compile(r"[ \t]*\n[ \t]*")
+_BULLET_CHARS_RE = re.compile(r"[•-]")
+_SECTION_OPEN = '<div style="margin-bottom: 12px;"><strong style="color: #1e3a8a;">{header}</strong> '
+_POINTS_OPEN = '<div style="margin-bottom: 12px;"><strong style="color: #1e3a8a;">{header}</strong><ul style="margin: 8px 0; padding-left: 20px;">'
+_POINT_ITEM = '<li style="margin-bottom: 6px; line-height: 1.5;">{point}</li>'
+
+
+@lru_cache(maxsize=1)
+def _section_patterns() -> Tuple["re.Pattern", Dict[str, Tuple[str, str]], Dict[str, Dict[str, str]]]:
+    """
+    Lookup tables for the summary parser, built on first use: language_config cannot be
+    imported at module load (circular import).
+    
+    Returns:
+        Regex matching a section header line of any language, header text -> (lang, header_type),
+        and lang -> header_type -> opening HTML of that section with its display header
+    """
+    from app.agent.language_config import LANGUAGE_CONFIG
+    
+    headers = {
+        header: (lang, header_type)
+        for lang, config in LANGUAGE_CONFIG.items()
+        for header_type, header in config["headers"].items()
+    }
+    alternatives = "|".join(re.escape(header) for header in sorted(headers, key=len, reverse=True))
+    openings = {
+        lang: {
+            header_type: (_POINTS_OPEN if header_type == "key_points" else _SECTION_OPEN).format(header=display_header)
+            for header_type, display_header in config["display_headers"].items()
+        }
+        for lang, config in LANGUAGE_CONFIG.items()
+    }
+    return re.compile(rf"^[ \t]*({alternatives}):(.*)$", re.M), headers, openings
+
+
+def _first_paragraph(text: str) -> str:
+    """Text up to the first blank line."""
+    return _BLANK_LINE_RE.split(text, 1)[0]
+
+
+@lru_cache(maxsize=4096)
+def _render_summary_html(summary_text: str, lang_code: str) -> str:
+    """
+    Convert structured summary text to formatted HTML, memoized per summary.
+    
+    A section runs from its "HEADER:" line to the first blank line or the next header.
+    
+    Args:
+        summary_text: Plain text summary with structure (English or Spanish)
+        lang_code: Language used when no header identifies the summary language
+    
+    Returns:
+        Formatted HTML string
+    """
+    if not summary_text:
+        return ""
+    
+    section_re, headers, openings = _section_patterns()
+    matches = list(section_re.finditer(summary_text))
+    
+    # Detect language from the first overview or key points header found
+    detected_lang = next(
+        (headers[m.group(1)][0] for m in matches if headers[m.group(1)][1] in ("overview", "key_points")),
+        None
+    )
+    # Use detected language or fall back to current setting
+    opening = openings[detected_lang or lang_code]
+    
+    html_parts = []
+    for idx, match in enumerate(matches):
+        header_type = headers[match.group(1)][1]
+        body_end = matches[idx + 1].start() if idx + 1 < len(matches) else len(summary_text)
+        body = summary_text[match.end():body_end]
+        
+        if header_type == "key_points":
+            # One bullet per line; bullet characters are dropped wherever they appear
+            html_parts.append(opening[header_type])
+            for line in _first_paragraph(body).split("\n"):
+                point = _BULLET_CHARS_RE.sub("", line).strip()
+                if point:
+                    html_parts.append(_POINT_ITEM.format(point=point))
+            html_parts.append('</ul></div>')
+        else:
+            # Text on the header line and the lines below it, joined by single spaces
+            content = _LINE_BREAK_RE.sub(" ", _first_paragraph(match.group(2) + body).strip())
+            if content:
+                html_parts.append(f"{opening[header_type]}{content}</div>")
+    
+    # If no structured format found, return as-is with line breaks preserved
+    if not html_parts:
+        formatted = summary_text.replace('\n', '<br>')
+        return f'<div>{formatted}</div>'
+    
+    return ''.join(html_parts)
+
 
 class DatabaseManager:
     """Manages database operations for RSS articles using connection.py."""
@@ -22,8 +221,29 @@ class DatabaseManager:
         Uses the engine from connection.py.
         """
         Base.metadata.create_all(self.engine)
+        self._upgrade_schema()
         print("✓ Database tables created successfully")
 
+    def _upgrade_schema(self):
+        """
+        Bring databases created by older versions up to date with the models.
+        create_all() only creates missing tables, so columns and indexes added to
+        existing tables later are created here. Safe to run on every start.
+        """
+        # Columns added after the first release: ADD COLUMN, then backfill
+        collection_columns = {column["name"] for column in inspect(self.engine).get_columns("collections")}
+        if "article_count" not in collection_columns:
+            with self.engine.begin() as connection:
+                connection.execute(text(
+                    "ALTER TABLE collections ADD COLUMN article_count INTEGER NOT NULL DEFAULT 0"
+                ))
+                connection.execute(_REFRESH_ARTICLE_COUNTS_STMT)
+            print("✓ Added collections.article_count")
+        
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(self.engine, checkfirst=True)
+
     def get_session(self):
         """
         Get a new database session.
@@ -31,6 +251,101 @@ class DatabaseManager:
         """
         return get_session()
 
+    @contextmanager
+    def _session_scope(self, commit: bool = True):
+        """
+        Session for one unit of work, always closed when the block ends.
+        
+        Args:
+            commit: Run the block in one transaction (session.begin()), committed if it
+                succeeds and rolled back if it raises. Read-only blocks pass False so the
+                objects they return are not expired by a commit; closing the session
+                rolls their transaction back
+        """
+        with self.get_session() as session:
+            if commit:
+                with session.begin():
+                    yield session
+            else:
+                yield session
+
+    @staticmethod
+    def _upsert_collections(session, sources: set, extraction_id: int) -> dict:
+        """
+        Create missing collections and link all of them to the extraction.
+        
+        Args:
+            session: Open session
+            sources: Source names of the extraction
+            extraction_id: ID of the extraction being inserted
+            
+        Returns:
+            Dict of source name to collection ID
+        """
+        if not sources:
+            return {}
+        
+        upsert = _UPSERT_STATEMENTS.get(session.get_bind().dialect.name)
+        if upsert is not None:
+            # One INSERT ... ON CONFLICT (source) DO UPDATE ... RETURNING for every source
+            return dict(session.execute(
+                upsert.collections, [{"source": source, "extraction_id": extraction_id} for source in sources]
+            ).all())
+        
+        # Other databases: one query for all sources, one flush for the new ones
+        collections = {
+            collection.source: collection
+            for collection in session.query(Collection).filter(Collection.source.in_(sources))
+        }
+        for source in sources:
+            collection = collections.get(source)
+            if not collection:
+                collections[source] = Collection(source=source, extraction_id=extraction_id)
+                session.add(collections[source])
+            else:
+                # Update existing collection to link to this extraction
+                collection.extraction_id = extraction_id
+        session.flush()  # Get the new collection IDs
+        return {source: collection.id for source, collection in collections.items()}
+
+    @staticmethod
+    def _upsert_articles(session, rows: List[dict]):
+        """
+        Insert new articles and refresh existing ones (matched by link).
+        
+        Existing articles get the non-empty title, summary, content and source of
+        their row; published and collection_id stay as first stored.
+        
+        Args:
+            session: Open session
+            rows: Article rows with unique links
+        """
+        upsert = _UPSERT_STATEMENTS.get(session.get_bind().dialect.name)
+        if upsert is not None:
+            # Single INSERT ... ON CONFLICT (link) DO UPDATE, no read before write
+            session.execute(upsert.articles, rows)
+            return
+        
+        # Other databases: one query for the existing links, then one executemany
+        # INSERT for the new articles and one executemany UPDATE for the others
+        existing_ids = dict(session.execute(
+            select(Article.link, Article.id).where(Article.link.in_([row["link"] for row in rows]))
+        ).all())
+        new_rows = [row for row in rows if row["link"] not in existing_ids]
+        updates = [
+            {
+                "b_id": existing_ids[row["link"]],
+                **{f"b_{field}": row[field] for field in ("title", "summary", "content", "source")}
+            }
+            for row in rows if row["link"] in existing_ids
+        ]
+        if new_rows:
+            # Table insert, not insert(Article): the ORM bulk path would hydrate
+            # defaults the caller never reads
+            session.execute(_INSERT_ARTICLE_STMT, new_rows)
+        if updates:
+            session.execute(_UPDATE_ARTICLE_STMT, updates)
+
     def insert_extraction(self, extraction_data: ExtractionType) -> int:
         """
         Insert all articles from extraction data structure.
@@ -41,106 +356,97 @@ class DatabaseManager:
         Returns:
             ID of the created extraction record
         """
-        session = self.get_session()
         try:
-            # Create extraction record
-            extraction = Extraction()
-            session.add(extraction)
-            session.flush()  # Get the extraction ID
-
-            # Process each collection
-            for collection_data in extraction_data.get("scraping", []):
-                source = collection_data.get("source", "")
-                
-                # Get or create collection
-                collection = session.query(Collection).filter_by(source=source).first()
-                if not collection:
-                    collection = Collection(source=source, extraction_id=extraction.id)
-                    session.add(collection)
-                    session.flush()
-                else:
-                    # Update existing collection to link to this extraction
-                    collection.extraction_id = extraction.id
-
-                # Insert articles
-                for article_data in collection_data.get("articles", []):
-                    # Use article source or fallback to collection source
-                    article_source = article_data.get("source", "") or source
-                    
-                    # Check if article already exists (by link)
-                    existing_article = session.query(Article).filter_by(
-                        link=article_data.get("link", "")
-                    ).first()
-                    
-                    if not existing_article:
-                        article = Article(
-                            title=article_data.get("title", ""),
-                            source=article_source,
-                            link=article_data.get("link", ""),
-                            published=article_data.get("published", ""),
-                            content=article_data.get("content", ""),
-                            summary=article_data.get("summary", ""),
-                            collection_id=collection.id
-                        )
-                        session.add(article)
-                    else:
-                        # Update existing article with new data if provided
-                        if article_data.get("title"):
-                            existing_article.title = article_data.get("title", "")
-                        if article_data.get("summary"):
-                            existing_article.summary = article_data.get("summary", "")
-                        if article_data.get("content"):
-                            existing_article.content = article_data.get("content", "")
-                        if article_source:
-                            existing_article.source = article_source
-
-            session.commit()
-            print(f"✓ Inserted extraction with {len(extraction_data.get('scraping', []))} collections")
-            return extraction.id
+            with self._session_scope() as session:
+                # Create extraction record; its ID comes back from the INSERT itself
+                # (RETURNING where supported, the cursor's lastrowid otherwise)
+                extraction_id = session.execute(insert(Extraction)).inserted_primary_key[0]
 
+                collections_data = extraction_data.get("scraping", [])
+                collection_ids = self._upsert_collections(
+                    session, {collection_data.get("source", "") for collection_data in collections_data}, extraction_id
+                )
+
+                # Rows per link; a link repeated in the batch (unique column) is merged into one row
+                rows = {}
+                for collection_data in collections_data:
+                    source = collection_data.get("source", "")
+                    for article_data in collection_data.get("articles", []):
+                        link = article_data.get("link", "")
+                        # Use article source or fallback to collection source
+                        article_source = article_data.get("source", "") or source
+                        if link in rows:
+                            _merge_article_fields(rows[link], article_data, article_source)
+                        else:
+                            rows[link] = {
+                                "title": article_data.get("title", ""),
+                                "source": article_source,
+                                "link": link,
+                                "published": article_data.get("published", ""),
+                                "content": article_data.get("content", ""),
+                                "summary": article_data.get("summary", ""),
+                                "collection_id": collection_ids[source]
+                            }
+
+                # Written in chunks so huge extractions keep statements and IN lists bounded
+                pending = iter(rows.values())
+                while chunk := list(islice(pending, ARTICLE_WRITE_BATCH_SIZE)):
+                    self._upsert_articles(session, chunk)
+                
+                # Keep the stored article counts in step with the rows just written
+                if collection_ids:
+                    session.execute(_REFRESH_ARTICLE_COUNTS_STMT.where(
+                        Collection.__table__.c.id.in_(collection_ids.values())
+                    ))
         except Exception as e:
-            session.rollback()
             print(f"✗ Error inserting extraction: {e}")
             raise
-        finally:
-            session.close()
 
-    def get_all_articles(self, limit: Optional[int] = None):
-        """Retrieve all articles from database."""
-        session = self.get_session()
-        try:
-            query = session.query(Article).order_by(Article.created_at.desc())
-            if limit:
-                query = query.limit(limit)
-            return query.all()
-        finally:
-            session.close()
-
-    def get_articles_by_source(self, source: str):
-        """Retrieve articles filtered by source."""
-        session = self.get_session()
-        try:
-            return session.query(Article).filter_by(source=source).all()
-        finally:
-            session.close()
+        _today_news_cache.clear()
+        print(f"✓ Inserted extraction with {len(extraction_data.get('scraping', []))} collections")
+        return extraction_id
+
+    def get_all_articles(self, limit: Optional[int] = None) -> Iterator[Article]:
+        """
+        Retrieve all articles from database, newest first.
+        
+        Rows are streamed in batches of ARTICLE_BATCH_SIZE, so memory use does not grow
+        with the table. The session stays open until the iterator is exhausted or closed.
+        """
+        stmt = select(Article).order_by(Article.created_at.desc())
+        if limit:
+            stmt = stmt.limit(limit)
+        yield from self._stream_articles(stmt)
+
+    def get_articles_by_source(self, source: str) -> Iterator[Article]:
+        """Retrieve articles filtered by source, streamed like get_all_articles."""
+        yield from self._stream_articles(select(Article).filter_by(source=source))
+
+    def _stream_articles(self, stmt) -> Iterator[Article]:
+        """Yield the Article rows of stmt, fetched ARTICLE_BATCH_SIZE at a time."""
+        with self._session_scope(commit=False) as session:
+            yield from session.execute(stmt.execution_options(yield_per=ARTICLE_BATCH_SIZE)).scalars()
 
     def get_collections(self):
         """Retrieve all collections with article counts."""
-        session = self.get_session()
-        try:
-            collections = session.query(Collection).all()
-            result = []
-            for col in collections:
-                article_count = session.query(Article).filter_by(collection_id=col.id).count()
-                result.append({
-                    "id": col.id,
-                    "source": col.source,
+        with self._session_scope(commit=False) as session:
+            # Article counts are stored on the collection, no aggregation needed
+            rows = session.query(
+                Collection.id,
+                Collection.source,
+                Collection.created_at,
+                Collection.article_count
+            ).all()
+            result = [
+                {
+                    "id": col_id,
+                    "source": source,
                     "article_count": article_count,
-                    "created_at": col.created_at
-                })
+                    "created_at": created_at
+                }
+                for col_id, source, created_at, article_count in rows
+            ]
             return result
-        finally:
-            session.close()
 
     def _format_summary_html(self, summary_text: str) -> str:
         """
@@ -154,171 +460,44 @@ class DatabaseManager:
             Formatted HTML string
         """
         # Import here to avoid circular import
-        from app.agent.language_config import get_language_config, LANGUAGE_CONFIG
-        
-        if not summary_text:
-            return ""
+        from app.agent.language_config import get_language
         
-        # Detect language from first header found
-        detected_lang = None
-        for line in summary_text.split('\n'):
-            line_stripped = line.strip()
-            if line_stripped.startswith('RESUMEN:') or line_stripped.startswith('PUNTOS CLAVE:'):
-                detected_lang = "ES"
-                break
-            elif line_stripped.startswith('OVERVIEW:') or line_stripped.startswith('KEY POINTS:'):
-                detected_lang = "ENG"
-                break
-        
-        # Use detected language or fall back to current setting
-        if detected_lang:
-            from app.agent.language_config import LANGUAGE_CONFIG
-            lang_config = LANGUAGE_CONFIG[detected_lang]
-        else:
-            lang_config = get_language_config()
+        return _render_summary_html(summary_text, get_language())
+
+    def iter_today_news(self) -> Iterator[dict]:
+        """
+        Yield today's summarized articles formatted for email, newest first.
         
-        html_parts = []
-        lines = summary_text.split('\n')
-        i = 0
+        Rows are streamed TODAY_NEWS_BATCH_SIZE at a time, so memory use stays flat
+        however many articles were stored today. The session stays open until the
+        iterator is exhausted or closed.
         
-        while i < len(lines):
-            line = lines[i].strip()
-            
-            # OVERVIEW/RESUMEN section
-            overview_header = lang_config["headers"]["overview"] + ":"
-            if line.startswith(overview_header) or line.startswith("OVERVIEW:") or line.startswith("RESUMEN:"):
-                header_text = lang_config["display_headers"]["overview"]
-                # Remove any of the possible headers
-                content_parts = [line.replace(overview_header, '').replace("OVERVIEW:", '').replace("RESUMEN:", '').strip()]
-                next_sections = (
-                    lang_config["headers"]["key_points"] + ":",
-                    lang_config["headers"]["why_it_matters"] + ":",
-                    lang_config["headers"]["simple_explanation"] + ":",
-                    "KEY POINTS:", "PUNTOS CLAVE:",
-                    "WHY IT MATTERS:", "POR QUÉ IMPORTA:",
-                    "SIMPLE EXPLANATION:", "EXPLICACIÓN SIMPLE:"
-                )
-                
-                i += 1
-                # Collect content until next section or empty line
-                while i < len(lines):
-                    next_line = lines[i].strip()
-                    if next_line.startswith(next_sections):
-                        break
-                    if not next_line and content_parts:
-                        break
-                    if next_line:
-                        content_parts.append(next_line)
-                    i += 1
-                content = ' '.join(content_parts).strip()
-                if content:
-                    html_parts.append(f'<div style="margin-bottom: 12px;"><strong style="color: #1e3a8a;">{header_text}</strong> {content}</div>')
-                continue
-            
-            # KEY POINTS/PUNTOS CLAVE section
-            key_points_header = lang_config["headers"]["key_points"] + ":"
-            if line.startswith(key_points_header) or line.startswith("KEY POINTS:") or line.startswith("PUNTOS CLAVE:"):
-                header_text = lang_config["display_headers"]["key_points"]
-                next_sections = (
-                    lang_config["headers"]["why_it_matters"] + ":",
-                    lang_config["headers"]["simple_explanation"] + ":",
-                    lang_config["headers"]["overview"] + ":",
-                    "WHY IT MATTERS:", "POR QUÉ IMPORTA:",
-                    "SIMPLE EXPLANATION:", "EXPLICACIÓN SIMPLE:",
-                    "OVERVIEW:", "RESUMEN:"
-                )
-                
-                html_parts.append(f'<div style="margin-bottom: 12px;"><strong style="color: #1e3a8a;">{header_text}</strong><ul style="margin: 8px 0; padding-left: 20px;">')
-                i += 1
-                # Collect bullet points
-                while i < len(lines):
-                    bullet_line = lines[i].strip()
-                    if bullet_line.startswith('•') or bullet_line.startswith('-'):
-                        # Remove bullet characters from anywhere in the string
-                        point = bullet_line.replace('•', '').replace('-', '').strip()
-                        if point:
-                            html_parts.append(f'<li style="margin-bottom: 6px; line-height: 1.5;">{point}</li>')
-                    elif bullet_line and not bullet_line.startswith(next_sections):
-                        # Handle points without bullet prefix - still remove any bullet chars
-                        point = bullet_line.replace('•', '').replace('-', '').strip()
-                        if point:
-                            html_parts.append(f'<li style="margin-bottom: 6px; line-height: 1.5;">{point}</li>')
-                    else:
-                        break
-                    i += 1
-                html_parts.append('</ul></div>')
-                continue
-            
-            # WHY IT MATTERS/POR QUÉ IMPORTA section
-            why_matters_header = lang_config["headers"]["why_it_matters"] + ":"
-            if line.startswith(why_matters_header) or line.startswith("WHY IT MATTERS:") or line.startswith("POR QUÉ IMPORTA:"):
-                header_text = lang_config["display_headers"]["why_it_matters"]
-                # Remove any of the possible headers
-                content_parts = [line.replace(why_matters_header, '').replace("WHY IT MATTERS:", '').replace("POR QUÉ IMPORTA:", '').strip()]
-                next_sections = (
-                    lang_config["headers"]["key_points"] + ":",
-                    lang_config["headers"]["simple_explanation"] + ":",
-                    lang_config["headers"]["overview"] + ":",
-                    "KEY POINTS:", "PUNTOS CLAVE:",
-                    "SIMPLE EXPLANATION:", "EXPLICACIÓN SIMPLE:",
-                    "OVERVIEW:", "RESUMEN:"
-                )
-                
-                i += 1
-                # Collect content until next section or empty line
-                while i < len(lines):
-                    next_line = lines[i].strip()
-                    if next_line.startswith(next_sections):
-                        break
-                    if not next_line and content_parts:
-                        break
-                    if next_line:
-                        content_parts.append(next_line)
-                    i += 1
-                content = ' '.join(content_parts).strip()
-                if content:
-                    html_parts.append(f'<div style="margin-bottom: 12px;"><strong style="color: #1e3a8a;">{header_text}</strong> {content}</div>')
-                continue
-            
-            # SIMPLE EXPLANATION/EXPLICACIÓN SIMPLE section
-            simple_explanation_header = lang_config["headers"]["simple_explanation"] + ":"
-            if line.startswith(simple_explanation_header) or line.startswith("SIMPLE EXPLANATION:") or line.startswith("EXPLICACIÓN SIMPLE:"):
-                header_text = lang_config["display_headers"]["simple_explanation"]
-                # Remove any of the possible headers
-                content_parts = [line.replace(simple_explanation_header, '').replace("SIMPLE EXPLANATION:", '').replace("EXPLICACIÓN SIMPLE:", '').strip()]
-                next_sections = (
-                    lang_config["headers"]["key_points"] + ":",
-                    lang_config["headers"]["why_it_matters"] + ":",
-                    lang_config["headers"]["overview"] + ":",
-                    "KEY POINTS:", "PUNTOS CLAVE:",
-                    "WHY IT MATTERS:", "POR QUÉ IMPORTA:",
-                    "OVERVIEW:", "RESUMEN:"
-                )
-                
-                i += 1
-                # Collect content until next section or empty line
-                while i < len(lines):
-                    next_line = lines[i].strip()
-                    if next_line.startswith(next_sections):
-                        break
-                    if not next_line and content_parts:
-                        break
-                    if next_line:
-                        content_parts.append(next_line)
-                    i += 1
-                content = ' '.join(content_parts).strip()
-                if content:
-                    html_parts.append(f'<div style="margin-bottom: 12px;"><strong style="color: #1e3a8a;">{header_text}</strong> {content}</div>')
-                continue
-            
-            i += 1
+        Yields:
+            News item dicts, see aggregate_today_news
+        """
+        # Get today's date (start of day)
+        today_start = datetime.combine(date.today(), datetime.min.time())
+        today_end = datetime.combine(date.today(), datetime.max.time())
         
-        # If no structured format found, return as-is with line breaks preserved
-        if not html_parts:
-            formatted = summary_text.replace('\n', '<br>')
-            return f'<div>{formatted}</div>'
+        # Articles created today that have summaries, loading only the columns used
+        stmt = select(Article).options(
+            load_only(Article.title, Article.source, Article.link, Article.summary)
+        ).where(
+            Article.created_at >= today_start,
+            Article.created_at <= today_end,
+            Article.summary.isnot(None),
+            Article.summary != ""
+        ).order_by(Article.created_at.desc()).execution_options(yield_per=TODAY_NEWS_BATCH_SIZE)
         
-        return ''.join(html_parts)
+        with self._session_scope(commit=False) as session:
+            for article in session.execute(stmt).scalars():
+                yield {
+                    "category": article.source,  # Use source as category
+                    "title": article.title,
+                    "summary": self._format_summary_html(article.summary),  # Format as HTML
+                    "source": article.source,
+                    "link": article.link
+                }
 
     def aggregate_today_news(self) -> List[dict]:
         """
@@ -333,40 +512,20 @@ class DatabaseManager:
                 "source": str,
                 "link": str
             }
+            Results are reused for TODAY_NEWS_CACHE_TTL seconds or until the next insert.
         """
-        session = self.get_session()
+        # Import here to avoid circular import
+        from app.agent.language_config import get_language
         
-        try:
-            # Get today's date (start of day)
-            today_start = datetime.combine(date.today(), datetime.min.time())
-            today_end = datetime.combine(date.today(), datetime.max.time())
-            
-            # Query articles created today
-            articles = session.query(Article).filter(
-                Article.created_at >= today_start,
-                Article.created_at <= today_end
-            ).order_by(Article.created_at.desc()).all()
-            
-            # Convert to news_items format
-            news_items = []
-            for article in articles:
-                # Only include articles that have summaries
-                if not article.summary:
-                    continue
-                    
-                news_item = {
-                    "category": article.source,  # Use source as category
-                    "title": article.title,
-                    "summary": self._format_summary_html(article.summary),  # Format as HTML
-                    "source": article.source,
-                    "link": article.link
-                }
-                news_items.append(news_item)
-            
-            return news_items
-            
-        finally:
-            session.close()
+        cache_key = (date.today(), get_language())
+        cached = _today_news_cache.get(cache_key)
+        if cached is not None and time.monotonic() - cached[0] < TODAY_NEWS_CACHE_TTL:
+            news_items = cached[1]
+        else:
+            news_items = list(self.iter_today_news())
+            _today_news_cache[cache_key] = (time.monotonic(), news_items)
+        # Callers get their own dicts, so editing an item never changes the cached copy
+        return [dict(item) for item in news_items]
 
     def get_all_emails(self) -> List[str]:
         """
@@ -375,15 +534,11 @@ class DatabaseManager:
         Returns:
             List of email addresses (strings)
         """
-        session = self.get_session()
         try:
-            # Query the emails table directly using raw SQL
-            result = session.execute(text("SELECT email FROM emails"))
-            emails = [row[0] for row in result.fetchall()]
-            return emails
+            with self._session_scope(commit=False) as session:
+                # Query the emails table directly using raw SQL
+                return session.execute(_EMAILS_STMT).scalars().all()
         except Exception as e:
             print(f"✗ Error retrieving emails: {e}")
             return []
-        finally:
-            session.close()
 
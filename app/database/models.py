@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine, Column, Integer, String, Text, ForeignKey, DateTime
+from sqlalchemy import create_engine, Column, Integer, String, Text, ForeignKey, DateTime, Index, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, sessionmaker
 from datetime import datetime
@@ -12,18 +12,30 @@ class Article(Base):
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     title = Column(String(500), nullable=False)
-    source = Column(String(200), nullable=False)
+    source = Column(String(200), nullable=False, index=True)
     link = Column(String(1000), nullable=False, unique=True)
     published = Column(String(200))
     content = Column(Text)
     summary = Column(Text)  # AI-generated summary in plain language
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
     
-    # Foreign key to collection
+    # Foreign key to collection, indexed by ix_articles_collection_created_at below
     collection_id = Column(Integer, ForeignKey('collections.id'), nullable=False)
     
     # Relationship
     collection = relationship("Collection", back_populates="articles")
+    
+    # Composite index for "articles of a collection, newest first"; its collection_id
+    # prefix also serves the foreign key lookups (Collection.articles)
+    __table_args__ = (
+        Index("ix_articles_collection_created_at", "collection_id", "created_at"),
+        # Partial index for the newsletter query: articles of a day that already have a summary
+        Index(
+            "ix_articles_summarized_created_at", "created_at",
+            postgresql_where=text("summary IS NOT NULL AND summary <> ''"),
+            sqlite_where=text("summary IS NOT NULL AND summary <> ''")
+        ),
+    )
 
 
 class Collection(Base):
@@ -34,11 +46,14 @@ class Collection(Base):
     source = Column(String(200), nullable=False, unique=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Number of articles in the collection, refreshed by DatabaseManager.insert_extraction
+    article_count = Column(Integer, nullable=False, default=0, server_default="0")
     
     # Foreign key to extraction (optional - collections can exist without extraction)
-    extraction_id = Column(Integer, ForeignKey('extractions.id'), nullable=True)
+    extraction_id = Column(Integer, ForeignKey('extractions.id'), nullable=True, index=True)
     
-    # Relationships
+    # Relationships. Lazy by default: code that walks collections and their articles
+    # passes selectinload(Collection.articles) on its query to avoid one query per collection
     articles = relationship("Article", back_populates="collection", cascade="all, delete-orphan")
     extraction = relationship("Extraction", back_populates="collections")
 
@@ -50,6 +65,6 @@ class Extraction(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     
-    # Relationship to collections
+    # Relationship to collections (lazy, see Collection.articles)
     collections = relationship("Collection", back_populates="extraction")
 
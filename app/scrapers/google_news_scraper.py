@@ -4,17 +4,77 @@ Google News scraper using pygooglenews to create extraction objects.
 
 import os
 import json
-from typing import Dict, List, Optional
+import logging
+from typing import Dict, List, Optional, Tuple
 from datetime import date, datetime, timedelta
-import requests
-from markdownify import markdownify as md
+from selectolax.lexbor import LexborHTMLParser
 from pygooglenews import GoogleNews
-from dotenv import load_dotenv
-load_dotenv()
+from app.agent.language_config import bootstrap
+bootstrap()
 
 
 # Import the same TypedDict structures from rss_scraper
 from app.scrapers.rss_scraper import Article, collection, extraction
+from app.scrapers.http_session import MAX_CONCURRENCY, fetch_texts
+
+logger = logging.getLogger(__name__)
+
+
+# Elements whose text is never article content
+_NON_CONTENT_TAGS = ["script", "style", "noscript", "template"]
+
+# Elements that start a new line in _html_to_text; inline elements (<a>, <b>, <span>)
+# stay on the line of the block around them
+_BLOCK_TAGS = frozenset([
+    "p", "div", "section", "article", "main", "header", "footer", "aside", "nav",
+    "h1", "h2", "h3", "h4", "h5", "h6", "ul", "ol", "li", "dl", "dt", "dd",
+    "blockquote", "pre", "figure", "figcaption", "table", "tr", "td", "th", "form",
+])
+
+
+def _block_of(node, body_id: int) -> int:
+    """mem_id of the closest _BLOCK_TAGS ancestor of node, body_id if there is none."""
+    # Nodes are compared by mem_id: Node == Node serializes both subtrees to HTML
+    parent = node.parent
+    while parent is not None and parent.mem_id != body_id:
+        if parent.tag in _BLOCK_TAGS:
+            return parent.mem_id
+        parent = parent.parent
+    return body_id
+
+
+def _html_to_text(html_content: str) -> str:
+    """
+    Extract the visible text of an article page, one block per line.
+    Uses selectolax's lexbor backend (C parser); the cleaning LLM does not need Markdown structure.
+    
+    Args:
+        html_content: Raw HTML of the page
+    
+    Returns:
+        Page text, empty if the page has no body
+    """
+    tree = LexborHTMLParser(html_content)
+    tree.strip_tags(_NON_CONTENT_TAGS)
+    body = tree.body
+    if body is None:
+        return ""
+    lines, words, current = [], [], None
+    for node in body.traverse(include_text=True):
+        if node.tag != "-text":
+            continue
+        text = node.text_content.strip()
+        if not text:
+            continue
+        block = _block_of(node, body.mem_id)
+        if current is not None and block != current and words:
+            lines.append(" ".join(words))
+            words = []
+        current = block
+        words.append(text)
+    if words:
+        lines.append(" ".join(words))
+    return "\n".join(lines)
 
 
 class GoogleNewsFetcher:
@@ -29,6 +89,8 @@ class GoogleNewsFetcher:
             config_path: Path to JSON config file
         """
         self.gn = GoogleNews(lang='en', country='US')
+        # Results kept per search, read once from MAX_ARTICLES
+        self.max_articles = int(os.getenv("MAX_ARTICLES", "10"))
         self.config = {}
         
         if config is not None:
@@ -67,10 +129,10 @@ class GoogleNewsFetcher:
                 results = self.gn.search(query)
             
             articles = results.get('entries', [])
-            # Limit results to 10
-            return articles[:int(os.getenv("MAX_ARTICLES"))]
+            # Limit results to MAX_ARTICLES (10 by default)
+            return articles[:self.max_articles]
         except Exception as e:
-            print(f"Error searching Google News for '{query}': {e}")
+            logger.warning("Error searching Google News for '%s': %s", query, e)
             return []
     
     def get_entries(self, topic_name: str, filter_date: Optional[date] = None) -> List[Dict]:
@@ -85,7 +147,7 @@ class GoogleNewsFetcher:
             List of article dictionaries
         """
         if topic_name not in self.topics:
-            print(f"Warning: Topic '{topic_name}' not found in config")
+            logger.warning("Topic '%s' not found in config", topic_name)
             return []
         
         query = topic_name  # Use topic name as search query
@@ -121,7 +183,7 @@ class GoogleNewsFetcher:
             List of article dictionaries
         """
         if topic_name not in self.topics:
-            print(f"Warning: Topic '{topic_name}' not found in config")
+            logger.warning("Topic '%s' not found in config", topic_name)
             return []
         
         query = topic_name
@@ -154,22 +216,30 @@ class GoogleNewsFetcher:
 class GoogleNewsScraper:
     """Builds an `extraction` payload containing all Google News articles."""
     
-    def __init__(self, fetcher: GoogleNewsFetcher):
+    def __init__(self, fetcher: GoogleNewsFetcher, max_concurrency: int = MAX_CONCURRENCY):
         """
         Initialize Google News scraper.
         
         Args:
             fetcher: GoogleNewsFetcher instance
+            max_concurrency: Maximum number of article downloads in flight
         """
         self.fetcher = fetcher
+        self.max_concurrency = max_concurrency
+        # Text of every article downloaded by this scraper, by URL: Google News often
+        # returns the same article under several topics
+        self._md_cache: Dict[str, str] = {}
         self.data: extraction = {"scraping": []}
+        # Index of self.data["scraping"] by source name
+        self._by_source: Dict[str, collection] = {}
     
     def _ensure_collection(self, source: str) -> collection:
         """Ensure a collection exists for the given source."""
-        for col in self.data["scraping"]:
-            if col["source"] == source:
-                return col
+        col = self._by_source.get(source)
+        if col is not None:
+            return col
         new_col: collection = {"source": source, "articles": []}
+        self._by_source[source] = new_col
         self.data["scraping"].append(new_col)
         return new_col
     
@@ -181,7 +251,7 @@ class GoogleNewsScraper:
         Args:
             source: Source name
             entry: Google News entry dictionary
-            content: Article content (markdown)
+            content: Article content (page text)
             summary: Article summary (default empty)
         
         Returns:
@@ -204,28 +274,28 @@ class GoogleNewsScraper:
             summary=summary,
         )
     
-    def _fetch_markdown(self, url: str) -> str:
+    def _collect_entries(self, pairs: List[Tuple[str, Dict]]):
         """
-        Fetch article content and convert to markdown.
+        Download the articles of pairs concurrently and add them to their collections.
+        Each URL is downloaded and converted once, even if several topics carry it.
         
         Args:
-            url: Article URL
-        
-        Returns:
-            Markdown content string
+            pairs: (source name, Google News entry) tuples, in collection order
         """
-        if not url:
-            return ""
-        try:
-            response = requests.get(url, timeout=10, headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            })
-            html_content = response.text
-            markdown_content = md(html_content)
-            return markdown_content
-        except Exception as e:
-            print(f"Error fetching content from {url}: {e}")
-            return ""
+        missing = [
+            url for url in dict.fromkeys(entry.get("link", "") for _, entry in pairs)
+            if url and url not in self._md_cache
+        ]
+        for url, html_content in zip(missing, fetch_texts(missing, self.max_concurrency, timeout=10)):
+            # Failed downloads are not cached, a later collect retries them
+            if html_content is not None:
+                self._md_cache[url] = _html_to_text(html_content)
+        
+        for source_name, entry in pairs:
+            content = self._md_cache.get(entry.get("link", ""), "")
+            self._ensure_collection(source_name)["articles"].append(
+                self._entry_to_article(source_name, entry, content)
+            )
     
     def collect_topic(self, topic_name: str, filter_date: Optional[date] = None) -> collection:
         """
@@ -242,15 +312,14 @@ class GoogleNewsScraper:
         col = self._ensure_collection(source_name)
         
         entries = self.fetcher.get_entries(topic_name, filter_date)
-        for entry in entries:
-            content = self._fetch_markdown(entry.get("link", ""))
-            col["articles"].append(self._entry_to_article(source_name, entry, content))
+        self._collect_entries([(source_name, entry) for entry in entries])
         
         return col
     
     def collect_all(self, filter_date: Optional[date] = None) -> extraction:
         """
         Collect entries from all topics.
+        The articles of every topic are downloaded together, concurrently.
         
         Args:
             filter_date: Optional date to filter articles
@@ -258,8 +327,12 @@ class GoogleNewsScraper:
         Returns:
             extraction TypedDict
         """
+        pairs = []
         for topic_name in self.fetcher.get_topics().keys():
-            self.collect_topic(topic_name, filter_date)
+            source_name = self.fetcher.topics.get(topic_name, topic_name)
+            self._ensure_collection(source_name)
+            pairs.extend((source_name, entry) for entry in self.fetcher.get_entries(topic_name, filter_date))
+        self._collect_entries(pairs)
         return self.data
     
     def collect_date_range(
@@ -268,6 +341,7 @@ class GoogleNewsScraper:
         """
         Collect entries from all topics within a date range.
         Defaults to last 1 day (yesterday to today) if no dates provided.
+        The articles of every topic are downloaded together, concurrently.
         
         Args:
             start_date: Start date for filtering (defaults to yesterday)
@@ -281,13 +355,12 @@ class GoogleNewsScraper:
             end_date = datetime.now().date()
             start_date = end_date - timedelta(days=1)
         
+        pairs = []
         for topic_name in self.fetcher.get_topics().keys():
             entries = self.fetcher.get_entries_by_date_range(topic_name, start_date, end_date)
             source_name = self.fetcher.topics.get(topic_name, topic_name)
-            col = self._ensure_collection(source_name)
-            
-            for entry in entries:
-                content = self._fetch_markdown(entry.get("link", ""))
-                col["articles"].append(self._entry_to_article(source_name, entry, content))
+            self._ensure_collection(source_name)
+            pairs.extend((source_name, entry) for entry in entries)
+        self._collect_entries(pairs)
         
         return self.data
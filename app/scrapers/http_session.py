@@ -0,0 +1,196 @@
+"""
+Shared HTTP clients for the scrapers.
+
+Single downloads go through one requests.Session, so connections to the same host
+are kept alive and reused instead of paying a TCP+TLS handshake per URL. Batches of
+article pages are downloaded concurrently with aiohttp (fetch_texts).
+"""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# Browser user agent sent with every request; some sites reject the requests default
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+# Connections kept open per host, enough for the concurrent downloads of one run
+POOL_SIZE = 32
+
+# Retry policy for transient failures, shared by the requests and aiohttp clients:
+# RETRY_TOTAL retries after RETRY_BACKOFF * 2 ** attempt seconds
+RETRY_TOTAL = 2
+RETRY_BACKOFF = 0.3
+RETRY_STATUSES = (502, 503, 504)
+
+# Default number of article downloads in flight in fetch_texts
+MAX_CONCURRENCY = 16
+
+# Bytes of an article page that are read; the rest of a long page is navigation,
+# ads and analytics that the extractors discard anyway
+MAX_BODY_BYTES = 512 * 1024
+
+
+def _build_session() -> requests.Session:
+    """
+    Create a session with a pooled adapter mounted for http and https.
+    Connection errors and transient gateway errors (RETRY_STATUSES) are retried
+    RETRY_TOTAL times with backoff.
+
+    Returns:
+        Configured requests.Session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=POOL_SIZE,
+        pool_maxsize=POOL_SIZE,
+        max_retries=Retry(total=RETRY_TOTAL, backoff_factor=RETRY_BACKOFF, status_forcelist=list(RETRY_STATUSES))
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({'User-Agent': USER_AGENT})
+    return session
+
+
+# Module-level session, created once per process
+SESSION = _build_session()
+
+
+def get_session() -> requests.Session:
+    """
+    Get the shared HTTP session.
+
+    Returns:
+        Process-wide requests.Session with connection pooling
+    """
+    return SESSION
+
+
+async def aread(session: aiohttp.ClientSession, url: str,
+                max_bytes: Optional[int] = None) -> Tuple[bytes, Optional[str]]:
+    """
+    GET url with an aiohttp session, retrying like the shared requests session.
+
+    Args:
+        session: Open aiohttp session
+        url: URL to download
+        max_bytes: Stop reading the body after this many bytes, None reads it all
+
+    Returns:
+        (body truncated to max_bytes, charset declared by the response)
+
+    Raises:
+        aiohttp.ClientError: If the request still fails after RETRY_TOTAL retries
+    """
+    for attempt in range(RETRY_TOTAL + 1):
+        last_attempt = attempt == RETRY_TOTAL
+        try:
+            async with session.get(url) as response:
+                if response.status not in RETRY_STATUSES or last_attempt:
+                    response.raise_for_status()
+                    if max_bytes is None:
+                        return await response.read(), response.charset
+                    chunks, size = [], 0
+                    async for chunk in response.content.iter_chunked(64 * 1024):
+                        chunks.append(chunk)
+                        size += len(chunk)
+                        if size >= max_bytes:
+                            break
+                    return b"".join(chunks)[:max_bytes], response.charset
+        except aiohttp.ClientConnectionError:
+            if last_attempt:
+                raise
+        await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
+
+
+async def _afetch_text(session: aiohttp.ClientSession, semaphore: asyncio.Semaphore, url: str) -> Optional[str]:
+    """
+    Download one URL with a shared aiohttp session.
+
+    Args:
+        session: Open aiohttp session
+        semaphore: Bounds the downloads in flight
+        url: URL to download
+
+    Returns:
+        Decoded response body (at most MAX_BODY_BYTES), or None if the URL is empty
+        or the request failed
+    """
+    if not url:
+        return None
+    async with semaphore:
+        try:
+            # Only the first MAX_BODY_BYTES of the page are read
+            raw, charset = await aread(session, url, MAX_BODY_BYTES)
+            return raw.decode(charset or "utf-8", errors="replace")
+        except Exception as e:
+            logger.warning("Error fetching content from %s: %s", url, e)
+            return None
+
+
+async def afetch_texts(urls: List[str], max_concurrency: int = MAX_CONCURRENCY,
+                       timeout: float = 15) -> List[Optional[str]]:
+    """
+    Download several URLs concurrently, at most max_concurrency at a time.
+
+    Args:
+        urls: URLs to download
+        max_concurrency: Maximum number of downloads in flight
+        timeout: Total timeout of each download, in seconds
+
+    Returns:
+        Response bodies in the order of urls, None for the failed ones
+    """
+    connector = aiohttp.TCPConnector(limit=max_concurrency, ttl_dns_cache=300)
+    async with aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=timeout),
+        headers={'User-Agent': USER_AGENT}
+    ) as session:
+        semaphore = asyncio.Semaphore(max_concurrency)
+        return await asyncio.gather(*(_afetch_text(session, semaphore, url) for url in urls))
+
+
+def fetch_texts(urls: List[str], max_concurrency: int = MAX_CONCURRENCY,
+                timeout: float = 15) -> List[Optional[str]]:
+    """
+    Synchronous wrapper of afetch_texts for the scrapers' collect methods.
+    Also usable from a running event loop, see run_sync.
+
+    Args:
+        urls: URLs to download
+        max_concurrency: Maximum number of downloads in flight
+        timeout: Total timeout of each download, in seconds
+
+    Returns:
+        Response bodies in the order of urls, None for the failed ones
+    """
+    if not urls:
+        return []
+    return run_sync(afetch_texts(urls, max_concurrency, timeout))
+
+
+def run_sync(coro):
+    """
+    Run a coroutine to completion from synchronous code.
+    Inside a running event loop (Jupyter cell, async caller) asyncio.run() is not
+    allowed, so the coroutine then runs on its own loop in a worker thread.
+
+    Args:
+        coro: Coroutine to run
+
+    Returns:
+        The coroutine result
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
@@ -1,12 +1,16 @@
 import os
 import json
+import asyncio
 from pathlib import Path
 from typing import Dict, Optional, Any, TypedDict, List, NotRequired
+from email.utils import parsedate_to_datetime
 from datetime import datetime, date, timedelta
 import requests
+import aiohttp
 import feedparser
 import html2text
 from markdownify import markdownify as md 
+from app.scrapers.http_session import aread, get_session, run_sync
 import sys
 import os
 
@@ -22,6 +26,7 @@ class Article(TypedDict):
     content: str
     summary: str  # Structured summary in plain language
     rank_score: NotRequired[Optional[float]]  # Ranking score assigned by LLM (0-100)
+    dup_count: NotRequired[int]  # Number of feeds that carried this story
 
 
 class collection(TypedDict):
@@ -36,6 +41,11 @@ class extraction(TypedDict):
 
     scraping: List[collection]
 
+# feedparser options for every feed download. Only title, link and dates are read from
+# the entries, so the HTML sanitizing and relative-URL passes over their content are skipped
+FEED_PARSE_OPTIONS = {"sanitize_html": False, "resolve_relative_uris": False}
+
+
 class RSSFetcher:
     def __init__(self, config: Optional[Dict[str, str]] = None, config_path: Optional[str] = None,
                  timeout: int = 20, session: Optional[requests.Session] = None):
@@ -43,7 +53,7 @@ class RSSFetcher:
         Provide either config (dict with "RSS_URLS") or config_path to a JSON file.
         """
         self.timeout = timeout
-        self.session = session or requests.Session()
+        self.session = session or get_session()
         self.config = {}
         if config is not None:
             self.config = config
@@ -72,21 +82,57 @@ class RSSFetcher:
         try:
             resp = self.session.get(url, timeout=self.timeout)
             resp.raise_for_status()
-            parsed = feedparser.parse(resp.content)
+            parsed = feedparser.parse(resp.content, **FEED_PARSE_OPTIONS)
         except Exception as e:
             raise Exception(f"Error fetching feed {name}: {e}")
             parsed = None
         self.feeds[name] = parsed
         return parsed
 
+    async def _fetch_async(self, session: aiohttp.ClientSession, name: str, url: str):
+        """Fetch and parse a single feed with a shared aiohttp session."""
+        try:
+            content, _ = await aread(session, url)
+            parsed = feedparser.parse(content, **FEED_PARSE_OPTIONS)
+        except Exception as e:
+            raise Exception(f"Error fetching feed {name}: {e}")
+        return name, parsed
+
+    async def fetch_all_async(self, chunk_size: int = 16, chunk_delay: float = 0.2) -> Dict[str, Optional[feedparser.FeedParserDict]]:
+        """
+        Fetch all feeds from config concurrently and store results in self.feeds.
+        Feeds are requested in chunks of chunk_size, pausing chunk_delay seconds between chunks.
+        The aiohttp session sends the headers of self.session (User-Agent included) and
+        retries like the shared requests session; proxies, auth and cookies of
+        self.session only apply to fetch().
+        If a feed fails, the rest of its chunk still completes before the first error is raised.
+        """
+        items = list(self.get_feed_urls().items())
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        async with aiohttp.ClientSession(timeout=timeout, headers=dict(self.session.headers)) as session:
+            for start in range(0, len(items), chunk_size):
+                chunk = items[start:start + chunk_size]
+                results = await asyncio.gather(
+                    *(self._fetch_async(session, name, url) for name, url in chunk),
+                    return_exceptions=True
+                )
+                errors = [result for result in results if isinstance(result, BaseException)]
+                for result in results:
+                    if not isinstance(result, BaseException):
+                        name, parsed = result
+                        self.feeds[name] = parsed
+                if errors:
+                    raise errors[0]
+                if start + chunk_size < len(items):
+                    await asyncio.sleep(chunk_delay)
+        return self.feeds
+
     def fetch_all(self) -> Dict[str, Optional[feedparser.FeedParserDict]]:
         """
         Fetch all feeds from config and store results in self.feeds.
         """
-        urls = self.get_feed_urls()
-        for name, url in urls.items():
-            self.fetch(name, url)
-        return self.feeds
+        # run_sync also works from a running event loop (notebooks)
+        return run_sync(self.fetch_all_async())
 
     @staticmethod
     def _parse_entry_date(entry: feedparser.FeedParserDict) -> Optional[date]:
@@ -97,17 +143,16 @@ class RSSFetcher:
         # Try updated_parsed as fallback
         if hasattr(entry, "updated_parsed") and entry.updated_parsed:
             return date(*entry.updated_parsed[:3])
-        # Try parsing the published string manually
+        # Try parsing the published string manually: RFC 2822 (RSS pubDate), then ISO 8601
         pub_str = entry.get("published") or entry.get("pubDate") or ""
         if pub_str:
             try:
-                # Use feedparser to parse the date string
-                parsed_entry = feedparser.parse(f"<item><pubDate>{pub_str}</pubDate></item>")
-                if parsed_entry.entries and hasattr(parsed_entry.entries[0], "published_parsed"):
-                    parsed_date = parsed_entry.entries[0].published_parsed
-                    if parsed_date:
-                        return date(*parsed_date[:3])
-            except Exception:
+                return parsedate_to_datetime(pub_str).date()
+            except (TypeError, ValueError):
+                pass
+            try:
+                return datetime.fromisoformat(pub_str).date()
+            except ValueError:
                 pass
         return None
 
@@ -188,16 +233,18 @@ class Scraper:
     def __init__(self, fetcher: RSSFetcher):
         self.fetcher = fetcher
         self.data: extraction = {"scraping": []}
+        self._by_source: Dict[str, collection] = {}
         self._html_parser = html2text.HTML2Text()
         self._html_parser.ignore_links = False
         self._html_parser.ignore_images = True
         self._html_parser.body_width = 0
 
     def _ensure_collection(self, source: str) -> collection:
-        for col in self.data["scraping"]:
-            if col["source"] == source:
-                return col
+        col = self._by_source.get(source)
+        if col is not None:
+            return col
         new_col: collection = {"source": source, "articles": []}
+        self._by_source[source] = new_col
         self.data["scraping"].append(new_col)
         return new_col
 
@@ -216,7 +263,7 @@ class Scraper:
         if not url:
             return ""
         try:
-            response = requests.get(url)
+            response = self.fetcher.session.get(url)
             html_content = response.text
             markdown_content = md(html_content)
             return markdown_content
@@ -4,17 +4,23 @@ Yahoo News scraper using feedparser to create extraction objects.
 
 import os
 import json
-from typing import Dict, List, Optional
+import logging
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from email.utils import parsedate_to_datetime
 from datetime import date, datetime, timedelta
-import requests
 import feedparser
 from markdownify import markdownify as md
-from dotenv import load_dotenv
 from bs4 import BeautifulSoup
-load_dotenv()
+from app.agent.language_config import bootstrap
+bootstrap()
 
 # Import the same TypedDict structures from rss_scraper
-from app.scrapers.rss_scraper import Article, collection, extraction
+from app.scrapers.rss_scraper import FEED_PARSE_OPTIONS, Article, collection, extraction
+from app.scrapers.http_session import MAX_CONCURRENCY, fetch_texts, get_session
+
+logger = logging.getLogger(__name__)
 
 
 class YahooRSSFetcher:
@@ -30,6 +36,8 @@ class YahooRSSFetcher:
         """
         self.config = {}
         self.feeds: Dict[str, Optional[feedparser.FeedParserDict]] = {}
+        # (date, entry) pairs of the .html entries of each feed, built once per fetch
+        self._dated_entries: Dict[str, List[Tuple[Optional[date], Dict]]] = {}
         
         if config is not None:
             self.config = config
@@ -50,6 +58,25 @@ class YahooRSSFetcher:
         """Get all configured Yahoo RSS URLs."""
         return self.rss_urls
     
+    def _download(self, name: str, url: str) -> Optional[feedparser.FeedParserDict]:
+        """
+        Download and parse one RSS feed without touching self.feeds, safe to run from worker threads.
+        
+        Args:
+            name: Feed name identifier
+            url: Feed URL
+        
+        Returns:
+            Parsed feed or None on failure
+        """
+        try:
+            response = get_session().get(url, timeout=20, verify=False)
+            response.raise_for_status()
+            return feedparser.parse(response.content, **FEED_PARSE_OPTIONS)
+        except Exception as e:
+            logger.warning("Error fetching Yahoo RSS feed %s: %s", name, e)
+            return None
+    
     def fetch(self, name: str, url: Optional[str] = None) -> Optional[feedparser.FeedParserDict]:
         """
         Fetch and parse a single RSS feed.
@@ -66,31 +93,66 @@ class YahooRSSFetcher:
             if not url:
                 raise KeyError(f"No URL for feed name: {name}")
         
-        try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=20, verify=False)
-            response.raise_for_status()
-            parsed = feedparser.parse(response.content)
-            self.feeds[name] = parsed
-            return parsed
-        except Exception as e:
-            print(f"Error fetching Yahoo RSS feed {name}: {e}")
-            self.feeds[name] = None
-            return None
+        parsed = self._download(name, url)
+        self._store(name, parsed)
+        return parsed
     
-    def fetch_all(self) -> Dict[str, Optional[feedparser.FeedParserDict]]:
+    def fetch_all(self, max_workers: int = 16) -> Dict[str, Optional[feedparser.FeedParserDict]]:
         """
-        Fetch all feeds from config.
+        Fetch all feeds from config concurrently, one worker thread per feed up to max_workers.
+        
+        Args:
+            max_workers: Maximum number of feeds downloaded at the same time
         
         Returns:
             Dictionary of feed name to parsed feed
         """
-        for name, url in self.rss_urls.items():
-            self.fetch(name, url)
+        if not self.rss_urls:
+            return self.feeds
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(self.rss_urls))) as executor:
+            futures = {name: executor.submit(self._download, name, url) for name, url in self.rss_urls.items()}
+        # Merged after every worker finished, in config order, so self.feeds is only written here
+        for name, future in futures.items():
+            self._store(name, future.result())
         return self.feeds
     
+    def _store(self, name: str, parsed: Optional[feedparser.FeedParserDict]):
+        """
+        Save a fetched feed and precompute its (date, entry) pairs.
+        Only entries with .html links are kept (as shown in notebook); their dates are
+        parsed here once instead of on every get_entries* call.
+        
+        Args:
+            name: Feed name identifier
+            parsed: Parsed feed, None if the fetch failed
+        """
+        self.feeds[name] = parsed
+        entries = (parsed.get("entries") or []) if parsed else []
+        self._dated_entries[name] = [
+            (self._parse_entry_date(entry), entry)
+            for entry in entries if entry.get("link", "").endswith(".html")
+        ]
+    
+    def content_hash(self) -> str:
+        """
+        Hash the entries of all fetched feeds to detect runs with no new articles.
+        
+        Only entry links and publication dates are hashed: the raw XML also carries
+        fields like lastBuildDate that change on every request.
+        
+        Returns:
+            BLAKE2b hex digest, identical for two fetches with the same entries
+        """
+        digest = hashlib.blake2b()
+        for name in sorted(self.feeds):
+            feed = self.feeds[name]
+            entries = (feed.get("entries") or []) if feed else []
+            keys = sorted(f"{entry.get('link', '')}|{entry.get('published', '')}" for entry in entries)
+            digest.update(name.encode("utf-8"))
+            digest.update("\n".join(keys).encode("utf-8"))
+        return digest.hexdigest()
+    
     @staticmethod
     def _parse_entry_date(entry: feedparser.FeedParserDict) -> Optional[date]:
         """Extract date from entry, returning a date object or None."""
@@ -100,17 +162,16 @@ class YahooRSSFetcher:
         # Try updated_parsed as fallback
         if hasattr(entry, "updated_parsed") and entry.updated_parsed:
             return date(*entry.updated_parsed[:3])
-        # Try parsing the published string manually
+        # Try parsing the published string manually: RFC 2822 (RSS pubDate), then ISO 8601
         pub_str = entry.get("published") or entry.get("pubDate") or ""
         if pub_str:
             try:
-                # Use feedparser to parse the date string
-                parsed_entry = feedparser.parse(f"<item><pubDate>{pub_str}</pubDate></item>")
-                if parsed_entry.entries and hasattr(parsed_entry.entries[0], "published_parsed"):
-                    parsed_date = parsed_entry.entries[0].published_parsed
-                    if parsed_date:
-                        return date(*parsed_date[:3])
-            except Exception:
+                return parsedate_to_datetime(pub_str).date()
+            except (TypeError, ValueError):
+                pass
+            try:
+                return datetime.fromisoformat(pub_str).date()
+            except ValueError:
                 pass
         return None
     
@@ -125,26 +186,12 @@ class YahooRSSFetcher:
         Returns:
             List of entry dictionaries (filtered to .html links only)
         """
-        feed = self.feeds.get(name)
-        if not feed:
-            return []
-        
-        entries = feed.get("entries") or []
-        
-        # Filter for .html links only (as shown in notebook)
-        html_entries = [entry for entry in entries if entry.get("link", "").endswith(".html")]
-        
+        dated_entries = self._dated_entries.get(name, [])
         if filter_date is None:
-            return html_entries
+            return [entry for _, entry in dated_entries]
         
         # Filter by date
-        filtered = []
-        for entry in html_entries:
-            entry_date = self._parse_entry_date(entry)
-            if entry_date == filter_date:
-                filtered.append(entry)
-        
-        return filtered
+        return [entry for entry_date, entry in dated_entries if entry_date == filter_date]
     
     def get_entries_by_date_range(
         self, name: str, start_date: Optional[date] = None, end_date: Optional[date] = None
@@ -160,22 +207,13 @@ class YahooRSSFetcher:
         Returns:
             List of entry dictionaries (filtered to .html links only)
         """
-        feed = self.feeds.get(name)
-        if not feed:
-            return []
-        
-        entries = feed.get("entries") or []
-        
-        # Filter for .html links only
-        html_entries = [entry for entry in entries if entry.get("link", "").endswith(".html")]
-        
+        dated_entries = self._dated_entries.get(name, [])
         if start_date is None and end_date is None:
-            return html_entries
+            return [entry for _, entry in dated_entries]
         
         # Filter by date range
         filtered = []
-        for entry in html_entries:
-            entry_date = self._parse_entry_date(entry)
+        for entry_date, entry in dated_entries:
             if entry_date is None:
                 continue
             if start_date and entry_date < start_date:
@@ -190,22 +228,29 @@ class YahooRSSFetcher:
 class YahooScraper:
     """Builds an `extraction` payload containing all Yahoo RSS articles."""
     
-    def __init__(self, fetcher: YahooRSSFetcher):
+    def __init__(self, fetcher: YahooRSSFetcher, max_concurrency: int = MAX_CONCURRENCY):
         """
         Initialize Yahoo scraper.
         
         Args:
             fetcher: YahooRSSFetcher instance
+            max_concurrency: Maximum number of article downloads in flight
         """
         self.fetcher = fetcher
+        self.max_concurrency = max_concurrency
+        # Articles collected per feed, read once from MAX_ARTICLES
+        self.max_articles = int(os.getenv("MAX_ARTICLES", "10"))
         self.data: extraction = {"scraping": []}
+        # Index of self.data["scraping"] by source name
+        self._by_source: Dict[str, collection] = {}
     
     def _ensure_collection(self, source: str) -> collection:
         """Ensure a collection exists for the given source."""
-        for col in self.data["scraping"]:
-            if col["source"] == source:
-                return col
+        col = self._by_source.get(source)
+        if col is not None:
+            return col
         new_col: collection = {"source": source, "articles": []}
+        self._by_source[source] = new_col
         self.data["scraping"].append(new_col)
         return new_col
     
@@ -240,10 +285,25 @@ class YahooScraper:
             summary=summary,
         )
     
+    # Candidate containers, in priority order. They are tried one by one: a single
+    # select_one with the selector group would return the first match in document order
+    _AUTHOR_SELECTORS = ('div.author-info', 'span.author')
+    _BODY_SELECTORS = ('div.article-body', 'div.caas-body', 'article', 'div[data-test="article-body"]')
+    
+    @staticmethod
+    def _select_first(soup: BeautifulSoup, selectors: Tuple[str, ...]):
+        """Return the element of the first selector that matches, or None."""
+        for selector in selectors:
+            element = soup.select_one(selector)
+            if element is not None:
+                return element
+        return None
+    
     def _fetch_content(self, html_content: str) -> str:
         """Extrae el contenido principal del artículo de Yahoo Finance"""
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            # lxml (libxml2) parsea bastante más rápido que html.parser
+            soup = BeautifulSoup(html_content, 'lxml')
             
             # Extraer datos del artículo
             articulo = {}
@@ -253,7 +313,7 @@ class YahooScraper:
             articulo['titulo'] = titulo.get_text(strip=True) if titulo else ''
             
             # Autor
-            autor = soup.find('div', class_='author-info') or soup.find('span', class_='author')
+            autor = self._select_first(soup, self._AUTHOR_SELECTORS)
             articulo['autor'] = autor.get_text(strip=True) if autor else ''
             
             # Fecha de publicación
@@ -264,12 +324,7 @@ class YahooScraper:
             contenido_principal = []
             
             # Buscar el contenido en diferentes posibles contenedores
-            article_body = (
-                soup.find('div', class_='article-body') or 
-                soup.find('div', class_='caas-body') or
-                soup.find('article') or
-                soup.find('div', {'data-test': 'article-body'})
-            )
+            article_body = self._select_first(soup, self._BODY_SELECTORS)
             
             if article_body:
                 # Extraer párrafos
@@ -285,23 +340,28 @@ class YahooScraper:
             return articulo
         
         except Exception as e:
-            print(f"Error al extraer contenido: {e}")
+            logger.warning("Error al extraer contenido: %s", e)
             return None
     
 
-    def _fetch_html(self, url: str) -> str:
-        """Obtiene el contenido HTML de una URL"""
-        try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=15)
-            response.raise_for_status()
-            return response.text
+    def _collect_entries(self, pairs: List[Tuple[str, Dict]]):
+        """
+        Download the articles of pairs concurrently and add them to their collections.
+        The HTML is parsed afterwards, one page at a time. A link carried by several
+        feeds is downloaded and parsed once.
         
-        except requests.exceptions.RequestException as e:
-            print(f"Error al obtener {url}: {e}")
-            return None
+        Args:
+            pairs: (feed name, RSS entry) tuples, in collection order
+        """
+        urls = [url for url in dict.fromkeys(entry.get("link", "") for _, entry in pairs) if url]
+        contents = {}
+        for url, html in zip(urls, fetch_texts(urls, self.max_concurrency, timeout=15)):
+            articulo = self._fetch_content(html) if html else None
+            contents[url] = articulo['contenido'] if articulo else ""
+        
+        for feed_name, entry in pairs:
+            content = contents.get(entry.get("link", ""), "")
+            self._ensure_collection(feed_name)["articles"].append(self._entry_to_article(feed_name, entry, content))
     
     def collect_feed(self, feed_name: str, filter_date: Optional[date] = None) -> collection:
         """
@@ -318,18 +378,16 @@ class YahooScraper:
         entries = self.fetcher.get_entries(feed_name, filter_date)
         
         # Limit to MAX_ARTICLES if set
-        max_articles = int(os.getenv("MAX_ARTICLES", "10"))
-        entries = entries[:max_articles]
+        entries = entries[:self.max_articles]
         
-        for entry in entries:
-            content = self._fetch_markdown(entry.get("link", ""))
-            col["articles"].append(self._entry_to_article(feed_name, entry, content))
+        self._collect_entries([(feed_name, entry) for entry in entries])
         
         return col
     
     def collect_all(self, filter_date: Optional[date] = None) -> extraction:
         """
         Collect entries from all feeds.
+        The articles of every feed are downloaded together, concurrently.
         
         Args:
             filter_date: Optional date to filter articles
@@ -337,8 +395,14 @@ class YahooScraper:
         Returns:
             extraction TypedDict
         """
+        pairs = []
         for feed_name in self.fetcher.get_rss_urls().keys():
-            self.collect_feed(feed_name, filter_date)
+            self._ensure_collection(feed_name)
+            entries = self.fetcher.get_entries(feed_name, filter_date)
+            
+            # Limit to MAX_ARTICLES if set
+            pairs.extend((feed_name, entry) for entry in entries[:self.max_articles])
+        self._collect_entries(pairs)
         return self.data
     
     def collect_date_range(
@@ -346,6 +410,7 @@ class YahooScraper:
     ) -> extraction:
         """
         Collect entries from all feeds within a date range.
+        The articles of every feed are downloaded together, concurrently.
         
         Args:
             start_date: Start date for filtering
@@ -354,20 +419,13 @@ class YahooScraper:
         Returns:
             extraction TypedDict
         """
+        pairs = []
         for feed_name in self.fetcher.get_rss_urls().keys():
             entries = self.fetcher.get_entries_by_date_range(feed_name, start_date, end_date)
-            col = self._ensure_collection(feed_name)
+            self._ensure_collection(feed_name)
             
             # Limit to MAX_ARTICLES if set
-            max_articles = int(os.getenv("MAX_ARTICLES", "10"))
-            entries = entries[:max_articles]
-            
-            for entry in entries:
-                html = self._fetch_html(entry.get("link", ""))
-                articulo = self._fetch_content(html)
-                content = articulo['contenido'] 
-                col["articles"].append(self._entry_to_article(feed_name, entry, content))
+            pairs.extend((feed_name, entry) for entry in entries[:self.max_articles])
+        self._collect_entries(pairs)
 
         return self.data
-    
-
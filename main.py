@@ -17,9 +17,8 @@ sys.path.insert(0, str(project_root))
 
 from app.database.db_manager import DatabaseManager
 from app.scrapers.rss_scraper import RSSFetcher, Scraper
-from app.agent.agent import ArticleSummarizerAgent
 from datetime import date, timedelta
-from app.agent.tools import send_daily_news_email
+# The agent and its LLM dependencies are imported inside main_yahoo(), after the feed check
 
 # Configure logging
 logging.basicConfig(
@@ -35,9 +34,11 @@ def main_yahoo():
     """
     from app.scrapers.yahoo_scraper import YahooScraper, YahooRSSFetcher
     from app.database.db_manager import DatabaseManager
-    from app.agent.agent import ArticleSummarizerAgent
-    from app.agent.tools import send_daily_news_email
+    # Only the cache is needed for the unchanged-feeds check; the agent and tools are
+    # imported below it, so a skipped run does not load the LLM stack
+    from app.agent import cache
     from datetime import date, timedelta
+    import os
 
     config_path = "config/config.json"
     days_back = 1
@@ -63,6 +64,15 @@ def main_yahoo():
         print(f"✗ Error fetching Yahoo feeds: {e}")
         return
 
+    # Skip LLM and email work when the feeds have the same entries as the last sent newsletter
+    feed_hash = fetcher.content_hash()
+    if os.getenv("SKIP_UNCHANGED_FEEDS", "1") != "0" and cache.get("last_feed_hash") == feed_hash:
+        print("✓ Feeds unchanged since the last newsletter, nothing to do")
+        return
+
+    from app.agent.agent import ArticleSummarizerAgent
+    from app.agent.tools import send_daily_news_email
+
     # Step 3: Scrape articles
     print("\n[Step 3] Scraping Yahoo News articles...")
     scraper = YahooScraper(fetcher)
@@ -125,9 +135,12 @@ def main_yahoo():
     print("Yahoo News pipeline completed successfully!")
     print("=" * 60)
     recipients = db_manager.get_all_emails()
-    send_daily_news_email(recipients=recipients)
+    if send_daily_news_email(recipients=recipients):
+        cache.put("last_feed_hash", feed_hash)
 
 
 
 if __name__ == "__main__":
+    from app.agent.language_config import bootstrap
+    bootstrap()
     main_yahoo()
\ No newline at end of file
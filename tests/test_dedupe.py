@@ -0,0 +1,34 @@
+"""Tests for the duplicate-story pass that runs before ranking."""
+import pytest
+
+agent = pytest.importorskip("app.agent.agent")
+
+
+def _items(*titles):
+    return [{"article": {"title": title, "link": f"https://example.com/{i}"}} for i, title in enumerate(titles)]
+
+
+@pytest.mark.parametrize("short, long", [
+    ("Stocks rally", "Stocks rally as Fed holds rates steady"),
+    ("Nvidia earnings", "Nvidia earnings beat estimates but stock slides 5%"),
+])
+def test_subset_titles_are_different_stories(short, long):
+    unique = agent.dedupe_articles(_items(short, long))
+    assert [item["article"]["title"] for item in unique] == [short, long]
+    assert all(item["article"]["dup_count"] == 1 for item in unique)
+
+
+def test_near_identical_titles_are_merged():
+    unique = agent.dedupe_articles(_items("Fed holds rates steady", "Fed holds rates steady."))
+    assert len(unique) == 1
+    assert unique[0]["article"]["dup_count"] == 2
+
+
+def test_same_canonical_url_is_merged():
+    items = [
+        {"article": {"title": "One", "link": "https://Example.com/story/?utm=a"}},
+        {"article": {"title": "Two", "link": "https://example.com/story#top"}},
+    ]
+    unique = agent.dedupe_articles(items)
+    assert len(unique) == 1
+    assert unique[0]["article"]["dup_count"] == 2